@@ -0,0 +1,142 @@
+import time
+import numpy as np
+import torch
+import chess
+from engines.bot.dataset import get_feature_deltas
+from engines.bot.bitboard import KING
+
+NULL_DELTA = ((), (), (), ()) # Pending delta of a null move (same accumulators as the parent)
+
+class AccumulatorStack:
+    """
+    Preallocated NNUE accumulators indexed by ply: [max_ply, 2 perspectives (BLACK=0, WHITE=1), hidden_dim].
+    A child slot is written in place from its parent slot, so nothing on the make/unmake path allocates arrays.
+    Updates are lazy: `push` only records the child's feature delta, `get` materializes it on first use.
+    King moves refresh the mover's perspective from a per-king-square cache ("Finny" table) instead of from scratch.
+    """
+    def __init__(self, model, max_ply):
+        # NumPy view on the feature transformer weights (shares memory with the torch module)
+        self.weights = model.feature_transformer.weight.detach().numpy()
+        hidden_dim = self.weights.shape[1]
+
+        self.acc = np.zeros((max_ply, 2, hidden_dim), dtype=np.float32)
+        self.tensor = torch.from_numpy(self.acc) # Same memory, for the torch forward pass
+
+        # Views per ply/perspective, created once so the hot path never builds new array objects
+        self.views = [[self.acc[ply, c] for c in (0, 1)] for ply in range(max_ply)]
+        self.tensor_views = [[self.tensor[ply, c:c + 1] for c in (0, 1)] for ply in range(max_ply)]
+
+        # Sibling Buffers -> [ply]: [n, 2, hidden_dim] child accumulators for batched evaluation (grown on demand)
+        self.siblings = [None] * max_ply
+
+        self.delta = [None] * max_ply # Pending (added_w, removed_w, added_b, removed_b), None lists = refresh perspective
+        self.dirty = [False] * max_ply
+
+        # Finny Tables -> [perspective][king square]: cached accumulator + the piece bitboards it was built from
+        self.finny_acc = np.zeros((2, 64, hidden_dim), dtype=np.float32)
+        self.finny_views = [[self.finny_acc[c, sq] for sq in range(64)] for c in (0, 1)]
+        self.finny_pieces = [[[0] * 14 for _ in range(64)] for _ in (0, 1)] # [color * 7 + piece_type] -> bitboard
+        self.reset_stats()
+
+    # Stats -> Perspectives updated incrementally vs refreshed, and the time spent materializing them
+    def reset_stats(self):
+        self.updates = 0
+        self.refreshes = 0
+        self.time = 0.0
+
+    # New search -> Rebuild cached entries from empty, bounds float32 drift from long chains of updates
+    def clear_cache(self):
+        self.finny_acc.fill(0)
+        for per_color in self.finny_pieces:
+            for pieces in per_color:
+                pieces[:] = [0] * 14
+
+    # Root -> Full refresh of slot 0
+    def set_root(self, board):
+        self.clear_cache()
+        self.refresh(board, 0, chess.WHITE)
+        self.refresh(board, 0, chess.BLACK)
+        self.dirty[0] = False
+
+    # Deferred Update -> Called before `move` is made at `ply`, only records the child's pending delta
+    def push(self, board, move, ply):
+        self.delta[ply + 1] = get_feature_deltas(board, move) if move else NULL_DELTA
+        self.dirty[ply + 1] = True
+
+    def get(self, board, ply):
+        """
+        Returns the [2, hidden_dim] accumulators of the node at `ply`, materializing them on first use.
+        `board` must be at that node, and its parent must already be materialized (done before a node expands).
+        """
+        if self.dirty[ply]:
+            start = time.perf_counter()
+            added_w, removed_w, added_b, removed_b = self.delta[ply]
+            if added_w is None:
+                self.refresh(board, ply, chess.WHITE)
+            else:
+                self.update(ply, chess.WHITE, added_w, removed_w)
+            if added_b is None:
+                self.refresh(board, ply, chess.BLACK)
+            else:
+                self.update(ply, chess.BLACK, added_b, removed_b)
+            self.dirty[ply] = False
+            self.time += time.perf_counter() - start
+        return self.acc[ply]
+
+    # Batched Siblings -> Buffer for n children of the node at `ply`, kept until that node returns
+    def sibling_buffer(self, ply, n):
+        buffer = self.siblings[ply]
+        if buffer is None or buffer.shape[0] < n:
+            buffer = np.zeros((max(n, 32), 2, self.acc.shape[2]), dtype=np.float32)
+            self.siblings[ply] = buffer
+        return buffer
+
+    # Load an already computed child accumulator into slot `ply` (replaces the pending delta)
+    def load(self, ply, acc):
+        np.copyto(self.acc[ply], acc)
+        self.dirty[ply] = False
+
+    # Refresh -> Bring the cached entry for this king square up to date with the board, then copy it into the slot
+    def refresh(self, board, ply, color):
+        self.refreshes += 1
+        k_sq = board.king_sq[color]
+        flip = 0 if color == chess.WHITE else 56
+        k_base = (k_sq ^ flip) * 640
+        cached = self.finny_views[color][k_sq]
+        cached_pieces = self.finny_pieces[color][k_sq]
+        pieces = board.pieces
+        occ = board.occ
+        weights = self.weights
+
+        for piece_color in (0, 1):
+            base = k_base + (-1 if piece_color == color else 4) # HalfKP piece index: ours 0-4(5), theirs 5-10
+            for piece_type in range(1, 7):
+                if piece_type == KING and piece_color == color:
+                    continue # Own king is the bucket, not a feature
+                slot = piece_color * 7 + piece_type
+                now = pieces[piece_type] & occ[piece_color]
+                before = cached_pieces[slot]
+                if now == before:
+                    continue
+                added = now & ~before
+                while added:
+                    b = added & -added
+                    added ^= b
+                    cached += weights[base + ((b.bit_length() - 1) ^ flip) * 10 + piece_type]
+                removed = before & ~now
+                while removed:
+                    b = removed & -removed
+                    removed ^= b
+                    cached -= weights[base + ((b.bit_length() - 1) ^ flip) * 10 + piece_type]
+                cached_pieces[slot] = now
+
+        np.copyto(self.views[ply][color], cached)
+
+    # Incremental Update -> child = parent + added rows - removed rows, written in place
+    def update(self, ply, color, added, removed):
+        self.updates += 1
+        acc = self.views[ply][color]
+        np.copyto(acc, self.views[ply - 1][color])
+        weights = self.weights
+        for i in added: acc += weights[i]
+        for i in removed: acc -= weights[i]
@@ -0,0 +1,312 @@
+import os
+import sys
+import json
+import time
+import uuid
+import hashlib
+import platform
+import argparse
+import statistics
+import subprocess
+from engines.bot.benchmark import BENCH_DEPTH, BENCH_TT_MB, BENCH_POSITIONS, run_bench
+from engines.bot.search import Searcher
+
+try:
+    import resource # Unix only
+except ImportError:
+    resource = None
+
+# Constants & Configuration
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HISTORY_PATH = os.path.join(os.path.dirname(__file__), "bench_history.jsonl") # Default store (BOT_BENCH_HISTORY overrides)
+DEFAULT_RUNS = 3
+MIN_THRESHOLD = 2.0 # %, smallest delta ever reported as a change
+NOISE_FACTOR = 3.0 # A delta must exceed this many relative MADs (of the noisier side) to count
+
+# Metrics -> [name]: (label, higher is better). Compared as medians over the runs of each revision
+METRICS = {
+    "nps": ("Nodes/second", True),
+    "time": ("Total time (s)", False),
+    "eval_throughput": ("Evals/second", True),
+    "memory_peak_mb": ("Memory peak (MB)", False),
+}
+
+def history_path(path=None):
+    return path or os.getenv("BOT_BENCH_HISTORY") or HISTORY_PATH
+
+# Git Revision -> Short hash of HEAD, "-dirty" when tracked files have uncommitted changes
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def git_revision():
+    rev = git("rev-parse", "--short=12", "HEAD")
+    if rev is None:
+        return "unknown"
+    return rev + "-dirty" if git("status", "--porcelain", "--untracked-files=no") else rev
+
+# Machine Fingerprint -> What the timings depend on besides the code; `machine_id` is its hash
+def cpu_model():
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def machine_fingerprint():
+    import numpy
+    import torch
+    machine = {
+        "host": platform.node(),
+        "cpu": cpu_model(),
+        "cpus": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "torch": torch.__version__,
+    }
+    machine_id = hashlib.sha1(json.dumps(machine, sort_keys=True).encode()).hexdigest()[:12]
+    return machine_id, machine
+
+def model_hash(path):
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+# Memory Peak -> Max resident set size of this process so far (MB), None where unavailable
+def memory_peak_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1) # Bytes on macOS, KB elsewhere
+
+# Time to Depth -> Seconds to complete each depth, summed over the positions that reached it
+def time_to_depth(report):
+    totals = {}
+    for position in report["positions"]:
+        for depth, seconds in position["time_to_depth"]:
+            totals[str(depth)] = totals.get(str(depth), 0.0) + seconds
+    return {depth: round(seconds, 4) for depth, seconds in totals.items()}
+
+def make_record(report, config, run_id, machine_id, machine):
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "run_id": run_id,
+        "rev": git_revision(),
+        "machine_id": machine_id,
+        "machine": machine,
+        "config": config,
+        "signature": report["signature"],
+        "nodes": report["nodes"],
+        "time": round(report["time"], 4),
+        "nps": report["nps"],
+        "evals": report["evals"],
+        "eval_throughput": report["eval_throughput"],
+        "time_to_depth": time_to_depth(report),
+        "memory_peak_mb": memory_peak_mb(),
+    }
+
+def append_records(records, path=None):
+    path = history_path(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+def load_records(path=None):
+    path = history_path(path)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def record_bench(runs=DEFAULT_RUNS, depth=BENCH_DEPTH, nodes=None, positions=None, model_path=None, backend="numpy", path=None, progress=None):
+    """
+    Runs the bench `runs` times in this process and appends one record per run to the history store.
+    Runs of one call share a `run_id`. Returns the records.
+    """
+    positions = positions or BENCH_POSITIONS
+    searcher = Searcher(model_path, tt_mb=BENCH_TT_MB, backend=backend)
+    machine_id, machine = machine_fingerprint()
+    config = {
+        "depth": None if nodes else depth,
+        "node_limit": nodes,
+        "positions": len(positions),
+        "backend": backend,
+        "model": model_hash(searcher.model_path),
+    }
+    run_id = uuid.uuid4().hex[:8]
+    records = []
+    for i in range(runs):
+        report = run_bench(depth, nodes, positions, searcher=searcher)
+        records.append(make_record(report, config, run_id, machine_id, machine))
+        if progress:
+            progress(i + 1, records[-1])
+    append_records(records, path)
+    return records
+
+# Revision Matching -> "abc123", "HEAD~2", "abc123-dirty": resolved through git when possible, else used as a hash prefix
+def resolve_revision(query):
+    dirty = query.endswith("-dirty")
+    base = query[:-len("-dirty")] if dirty else query
+    base = git("rev-parse", "--short=12", base) or base
+    return base, dirty
+
+def select_records(records, query, machine_id=None, config=None):
+    base, dirty = resolve_revision(query)
+    selected = []
+    for record in records:
+        rev = record["rev"]
+        if rev.endswith("-dirty") != dirty or not rev.startswith(base):
+            continue
+        if machine_id is not None and record["machine_id"] != machine_id:
+            continue
+        if config is not None and record["config"] != config:
+            continue
+        selected.append(record)
+    return selected
+
+# Noise -> Median absolute deviation relative to the median (%), 0 for a single run
+def relative_mad(values):
+    if len(values) < 2:
+        return 0.0
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    return 100.0 * mad / abs(median) if median else 0.0
+
+def compare_metric(old_values, new_values, higher_is_better, min_threshold=MIN_THRESHOLD):
+    old, new = statistics.median(old_values), statistics.median(new_values)
+    delta = 100.0 * (new - old) / abs(old) if old else 0.0
+    threshold = max(min_threshold, NOISE_FACTOR * max(relative_mad(old_values), relative_mad(new_values)))
+    if abs(delta) <= threshold:
+        verdict = "same"
+    else:
+        verdict = "better" if (delta > 0) == higher_is_better else "worse"
+    return {"old": old, "new": new, "delta": delta, "threshold": threshold, "verdict": verdict}
+
+def compare(records, old_rev, new_rev, machine_id=None, min_threshold=MIN_THRESHOLD):
+    """
+    Compares the runs of two revisions on one machine and bench config (those of the newest `new_rev` run).
+    Every metric compares medians; a delta only counts once it exceeds both `min_threshold` and the runs' own noise
+    (NOISE_FACTOR x relative MAD). Returns {"old", "new", "runs", "signature", "metrics", "time_to_depth"}.
+    """
+    new_records = select_records(records, new_rev, machine_id)
+    if not new_records:
+        raise ValueError(f"No bench records for revision {new_rev}.")
+    latest = new_records[-1]
+    machine_id, config = latest["machine_id"], latest["config"]
+    new_records = select_records(records, new_rev, machine_id, config)
+    old_records = select_records(records, old_rev, machine_id, config)
+    if not old_records:
+        raise ValueError(f"No bench records for revision {old_rev} on machine {machine_id} with config {config}.")
+
+    metrics = {}
+    for name, (label, higher_is_better) in METRICS.items():
+        old_values = [r[name] for r in old_records if r.get(name) is not None]
+        new_values = [r[name] for r in new_records if r.get(name) is not None]
+        if old_values and new_values:
+            metrics[name] = compare_metric(old_values, new_values, higher_is_better, min_threshold)
+
+    # Time to Depth -> Per depth reached by every run of both sides (lower is better)
+    depths = set.intersection(*(set(r["time_to_depth"]) for r in old_records + new_records))
+    ttd = {depth: compare_metric([r["time_to_depth"][depth] for r in old_records], [r["time_to_depth"][depth] for r in new_records], False, min_threshold)
+           for depth in sorted(depths, key=int)}
+
+    old_signatures = sorted({r["signature"] for r in old_records})
+    new_signatures = sorted({r["signature"] for r in new_records})
+    return {
+        "old": old_records[-1]["rev"],
+        "new": latest["rev"],
+        "machine_id": machine_id,
+        "config": config,
+        "runs": [len(old_records), len(new_records)],
+        "signature": {"old": old_signatures, "new": new_signatures, "changed": old_signatures != new_signatures},
+        "metrics": metrics,
+        "time_to_depth": ttd,
+    }
+
+def format_comparison(result):
+    old_runs, new_runs = result["runs"]
+    signature = result["signature"]
+    lines = [
+        f"{result['old']} ({old_runs} runs) -> {result['new']} ({new_runs} runs) on machine {result['machine_id']}, config {result['config']}",
+        f"Signature: {'/'.join(map(str, signature['old']))} -> {'/'.join(map(str, signature['new']))}" + (" (search changed)" if signature["changed"] else " (unchanged)"),
+        "",
+        f"{'metric':<22} {'old':>12} {'new':>12} {'delta':>9} {'noise':>8}  verdict",
+    ]
+    rows = [(METRICS[name][0], m) for name, m in result["metrics"].items()]
+    rows += [(f"Time to depth {depth} (s)", m) for depth, m in result["time_to_depth"].items()]
+    for label, m in rows:
+        lines.append(f"{label:<22} {m['old']:>12.6g} {m['new']:>12.6g} {m['delta']:>+8.1f}% {m['threshold']:>7.1f}%  {m['verdict']}")
+    if min(old_runs, new_runs) < 3:
+        lines += ["", "Fewer than 3 runs on one side: the noise estimate is unreliable (record with --runs 3 or more)."]
+    return "\n".join(lines)
+
+def format_records(records):
+    lines = [f"{'timestamp':<20} {'rev':<19} {'machine':<13} {'depth':>5} {'nodes':>7} {'backend':<7} {'signature':>10} {'nps':>8} {'evals/s':>9} {'mem MB':>7}"]
+    for r in records:
+        c = r["config"]
+        lines.append(f"{r['timestamp']:<20} {r['rev']:<19} {r['machine_id']:<13} {str(c['depth'] or '-'):>5} {str(c['node_limit'] or '-'):>7} {c['backend']:<7} "
+                     f"{r['signature']:>10} {r['nps']:>8} {r['eval_throughput']:>9} {str(r['memory_peak_mb']):>7}")
+    return "\n".join(lines)
+
+# CLI -> python -m engines.bot.benchhistory record|list|compare ...
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bench history: record bench runs per revision and compare revisions.")
+    parser.add_argument("--history", default=None, help="History file (default: engines/bot/bench_history.jsonl, or BOT_BENCH_HISTORY)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Run the bench and append the results")
+    record.add_argument("--model", default=None)
+    record.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    record.add_argument("--depth", type=int, default=BENCH_DEPTH)
+    record.add_argument("--nodes", type=int, default=None)
+    record.add_argument("--backend", default="numpy", choices=("numpy", "torch"))
+    record.add_argument("--positions", type=int, default=None, help="Only the first N positions")
+
+    listing = commands.add_parser("list", help="Show the recorded runs")
+    listing.add_argument("--rev", default=None, help="Only this revision")
+
+    comparison = commands.add_parser("compare", help="Compare two revisions (exit 1 on a regression)")
+    comparison.add_argument("old", help="Baseline revision (hash prefix, git ref, or <hash>-dirty)")
+    comparison.add_argument("new", nargs="?", default=None, help="Revision to check (default: the current one)")
+    comparison.add_argument("--any-machine", action="store_true", help="Use the new revision's latest machine instead of this one")
+    comparison.add_argument("--threshold", type=float, default=MIN_THRESHOLD, help="Minimum delta (%%) reported as a change")
+    comparison.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        positions = BENCH_POSITIONS[:args.positions] if args.positions else BENCH_POSITIONS
+        progress = lambda i, r: print(f"Run {i}/{args.runs}: {r['rev']} signature {r['signature']} nps {r['nps']} evals/s {r['eval_throughput']}")
+        try:
+            records = record_bench(args.runs, args.depth, args.nodes, positions, args.model, args.backend, args.history, progress)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Recorded {len(records)} runs to {history_path(args.history)}")
+        return 0
+
+    records = load_records(args.history)
+    if args.command == "list":
+        if args.rev:
+            records = select_records(records, args.rev)
+        print(format_records(records))
+        return 0
+
+    machine_id = None if args.any_machine else machine_fingerprint()[0]
+    try:
+        result = compare(records, args.old, args.new or git_revision(), machine_id, args.threshold)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2) if args.json else format_comparison(result))
+    regressed = any(m["verdict"] == "worse" for m in list(result["metrics"].values()) + list(result["time_to_depth"].values()))
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,169 @@
+import sys
+import json
+import argparse
+import contextlib
 import chess
-import time
-from engines.bot.main import get_move
-
-def benchmark():
-    board = chess.Board()
-    # A slightly complex position to avoid instant book/draws
-    board.set_fen("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 3 3")
-    
-    print("Starting Benchmark...")
-    start_time = time.time()
-    
-    # Run depth 3 for speed check
-    move = get_move(board, depth=3)
-    
-    end_time = time.time()
-    duration = end_time - start_time
-    
-    print(f"Time taken: {duration:.4f} seconds")
-    print(f"Move found: {move}")
+import chess.engine
+from engines.bot.search import Searcher, MAX_DEPTH
+
+# Constants & Configuration
+BENCH_DEPTH = 4 # Default fixed depth per position
+BENCH_TT_MB = 16
+
+# Bench Positions -> (category, FEN). Fixed set: changing it changes the node signature
+BENCH_POSITIONS = [
+    # Openings
+    ("opening", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    ("opening", "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 3 3"),
+    ("opening", "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/8/PPP2PPP/RNBQKB1R w KQkq - 1 5"),
+    ("opening", "rnbqkb1r/ppp1pppp/5n2/3p4/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 1 3"),
+    ("opening", "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/2P2N2/PP1P1PPP/RNBQK2R w KQkq - 1 5"),
+    ("opening", "rnbqk2r/ppp1ppbp/3p1np1/8/2PPP3/2N5/PP3PPP/R1BQKBNR w KQkq - 1 5"),
+    ("opening", "rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6 0 2"),
+    ("opening", "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"),
+    # Middlegames
+    ("middlegame", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10"),
+    ("middlegame", "4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19"),
+    ("middlegame", "r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14"),
+    ("middlegame", "r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15"),
+    ("middlegame", "r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13"),
+    ("middlegame", "r1bq1rk1/ppp1nppp/4n3/3p3Q/3P4/1BP1B3/PP1N2PP/R4RK1 w - - 1 16"),
+    ("middlegame", "4r1k1/r1q2ppp/ppp2n2/4P3/5Rb1/1N1BQ3/PPP3PP/R5K1 w - - 1 17"),
+    ("middlegame", "2rqkb1r/ppp2p2/2npb1p1/1N1Nn2p/2P1PP2/8/PP2B1PP/R1BQK2R b KQ - 0 11"),
+    ("middlegame", "r1bq1r1k/b1p1npp1/p2p3p/1p6/3PP3/1B2NN2/PP3PPP/R2Q1RK1 w - - 1 16"),
+    ("middlegame", "3r1rk1/p5pp/bpp1pp2/8/q1PP1P2/b3P3/P2NQRPP/1R2B1K1 b - - 6 22"),
+    ("middlegame", "r1q2rk1/2p1bppp/2Pp4/p6b/Q1PNp3/4B3/PP1R1PPP/2K4R w - - 2 18"),
+    ("middlegame", "4k2r/1pb2ppp/1p2p3/1R1p4/3P4/2r1PN2/P4PPP/1R4K1 b - - 3 22"),
+    ("middlegame", "3q2k1/pb3p1p/4pbp1/2r5/PpN2N2/1P2P2P/5PP1/Q2R2K1 b - - 4 26"),
+    ("middlegame", "2r3k1/pp3ppp/2n1b3/3pP3/3P4/2PB1N2/P4PPP/R5K1 w - - 0 1"),
+    ("middlegame", "r3k2r/pp1n1ppp/2p1pn2/q7/1bPP4/2N1PN2/PP1B1PPP/R2QKB1R w KQkq - 0 1"),
+    ("middlegame", "r3k2r/3nnpbp/q2pp1p1/p7/Pp1PPPP1/4BNN1/1P5P/R2Q1RK1 w kq - 0 16"),
+    # Endgames
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 11"),
+    ("endgame", "6k1/6p1/6Pp/ppp5/3pn2P/1P3K2/1PP2P2/3N4 b - - 0 1"),
+    ("endgame", "3b4/5kp1/1p1p1p1p/pP1PpP1P/P1P1P3/3KN3/8/8 w - - 0 1"),
+    ("endgame", "2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1"),
+    ("endgame", "8/6pk/1p6/8/PP3p1p/5P2/4KP1q/3Q4 w - - 0 1"),
+    ("endgame", "8/2p5/8/2kPKp1p/2p4P/2P5/3P4/8 w - - 0 1"),
+    ("endgame", "8/1p3pp1/7p/5P1P/2k3P1/8/2K2P2/8 w - - 0 1"),
+    ("endgame", "8/pp2r1k1/2p1p3/3pP2p/1P1P1P1P/P5KR/8/8 w - - 0 1"),
+    ("endgame", "5k2/7R/4P2p/5K2/p1r2P1p/8/8/8 b - - 0 1"),
+    ("endgame", "6k1/6p1/P6p/r1N5/5p2/7P/1b3PP1/4R1K1 w - - 0 1"),
+    ("endgame", "8/3p3B/5p2/5P2/p7/PP5b/k7/6K1 w - - 0 1"),
+    ("endgame", "8/8/8/8/5kp1/P7/8/1K1N4 w - - 0 1"),
+    ("endgame", "8/8/1P6/5pr1/8/4R3/7k/2K5 w - - 0 1"),
+    ("endgame", "8/8/4k3/8/2K5/8/3P4/8 w - - 0 1"),
+    # Tactical
+    ("tactical", "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"),
+    ("tactical", "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"),
+    ("tactical", "1r3k2/4q3/2Pp3b/3Bp3/2Q2p2/1p1P2P1/1P2KP2/3N4 w - - 0 1"),
+    ("tactical", "6k1/3b3r/1p1p4/p1n2p2/1PPNpP1q/P3Q1p1/1R1RB1P1/5K2 b - - 0 1"),
+    ("tactical", "r2r1n2/pp2bk2/2p1p2p/3q4/3PN1QP/2P3R1/P4PP1/5RK1 w - - 0 1"),
+    ("tactical", "8/R7/2q5/8/6k1/8/1P5p/K6R w - - 0 124"),
+]
+
+def bench_position(searcher, fen, depth, nodes=None):
+    """Searches one position from a cleared state (TT, eval cache, heuristics), so its node count only depends on the code."""
+    board = chess.Board(fen)
+    searcher.new_game()
+    limit = chess.engine.Limit(nodes=nodes) if nodes else chess.engine.Limit(depth=depth)
+    move = searcher.get_move(board, depth=MAX_DEPTH if nodes else depth, time_limit=limit)
+    stats = searcher.stats
+    return {
+        "fen": fen,
+        "move": move.uci() if move else None,
+        "depth": stats.depth,
+        "seldepth": stats.seldepth,
+        "nodes": stats.total_nodes,
+        "time": stats.time,
+        "nps": stats.nps,
+        "evals": stats.eval_probes - stats.eval_hits, # Network evaluations (eval cache misses)
+        "eval_time": stats.eval_time,
+        "time_to_depth": [[d, round(t, 4)] for d, _, t in stats.iterations],
+    }
+
+def run_bench(depth=BENCH_DEPTH, nodes=None, positions=None, model_path=None, backend="numpy", searcher=None, progress=None):
+    """
+    Runs the bench suite single-threaded at a fixed `depth` (or `nodes` per position) and returns
+    {"signature": total nodes, "nodes", "time", "nps", "positions": [per position results], ...}.
+    The signature is deterministic for a given model and search code: any change to it means the search changed.
+    """
+    if searcher is None:
+        searcher = Searcher(model_path, tt_mb=BENCH_TT_MB, backend=backend)
+    if not searcher.model_loaded:
+        raise RuntimeError("Bench needs a loaded model (pass model_path).")
+    searcher.set_threads(1)
+    searcher.verbose = False
+
+    results = []
+    for category, fen in positions or BENCH_POSITIONS:
+        result = bench_position(searcher, fen, depth, nodes)
+        result["category"] = category
+        results.append(result)
+        if progress:
+            progress(len(results), result)
+
+    total_nodes = sum(r["nodes"] for r in results)
+    total_time = sum(r["time"] for r in results)
+    evals = sum(r["evals"] for r in results)
+    eval_time = sum(r["eval_time"] for r in results)
+    return {
+        "signature": total_nodes,
+        "nodes": total_nodes,
+        "time": total_time,
+        "nps": int(total_nodes / total_time) if total_time > 0 else 0,
+        "evals": evals,
+        "eval_throughput": int(evals / eval_time) if eval_time > 0 else 0, # Network evaluations per second of eval time
+        "depth": None if nodes else depth,
+        "node_limit": nodes,
+        "backend": searcher.backend,
+        "positions": results,
+    }
+
+def format_text(report):
+    lines = [f"{'#':>3} {'category':<11} {'move':<6} {'depth':>5} {'nodes':>9} {'time':>8} {'nps':>8}  time to depth"]
+    for i, r in enumerate(report["positions"], 1):
+        ttd = " ".join(f"{d}:{t:.2f}" for d, t in r["time_to_depth"])
+        lines.append(f"{i:>3} {r['category']:<11} {str(r['move']):<6} {r['depth']:>5} {r['nodes']:>9} {r['time']:>7.2f}s {r['nps']:>8}  {ttd}")
+    lines += [
+        "",
+        f"Positions: {len(report['positions'])}  " + (f"Depth: {report['depth']}" if report["depth"] else f"Nodes/position: {report['node_limit']}") + f"  Backend: {report['backend']}",
+        f"Total time: {report['time']:.2f}s",
+        f"Nodes searched: {report['nodes']}",
+        f"Nodes/second: {report['nps']}",
+        f"Evals/second: {report['eval_throughput']} ({report['evals']} network evaluations)",
+        f"Signature: {report['signature']}",
+    ]
+    return "\n".join(lines)
+
+# CLI -> python -m engines.bot.benchmark --model path [--depth N | --nodes N] [--json] [--expect SIGNATURE] [--min-nps N]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fixed-depth/node bench: node-count signature and NPS.")
+    parser.add_argument("--model", default=None, help="Model path (default: engines/bot/model/mlp_model.pth)")
+    parser.add_argument("--depth", type=int, default=BENCH_DEPTH)
+    parser.add_argument("--nodes", type=int, default=None, help="Node limit per position instead of a fixed depth (checked every CHECK_INTERVAL nodes)")
+    parser.add_argument("--backend", default="numpy", choices=("numpy", "torch"))
+    parser.add_argument("--positions", type=int, default=None, help="Only the first N positions")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--expect", type=int, default=None, help="Fail (exit 1) unless the signature matches")
+    parser.add_argument("--min-nps", type=int, default=None, help="Fail (exit 1) below this NPS")
+    args = parser.parse_args(argv)
+
+    positions = BENCH_POSITIONS[:args.positions] if args.positions else BENCH_POSITIONS
+    progress = None if args.json else lambda i, r: print(f"Position {i}/{len(positions)}: {r['nodes']} nodes", file=sys.stderr)
+    with contextlib.redirect_stdout(sys.stderr): # Keep stdout clean for --json (the model loader prints)
+        searcher = Searcher(args.model, tt_mb=BENCH_TT_MB, backend=args.backend)
+    report = run_bench(args.depth, args.nodes, positions, searcher=searcher, progress=progress)
+    print(json.dumps(report, indent=2) if args.json else format_text(report))
+
+    failed = False
+    if args.expect is not None and report["signature"] != args.expect:
+        print(f"Signature mismatch: {report['signature']} != {args.expect}", file=sys.stderr)
+        failed = True
+    if args.min_nps is not None and report["nps"] < args.min_nps:
+        print(f"NPS below threshold: {report['nps']} < {args.min_nps}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
 
 if __name__ == "__main__":
-    benchmark()
+    sys.exit(main())
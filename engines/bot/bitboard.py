@@ -0,0 +1,681 @@
+import chess
+import chess.polyglot
+from engines.bot.zobrist import PIECE_KEYS, TURN_KEY, ZOBRIST
+
+# Internal search board -> Integer bitboards + mailbox, integer moves and a make/unmake undo stack.
+# python-chess is only used at the root (from_board / to_board), the search hot loop never touches chess.Board.
+
+# Pieces -> Mailbox code = piece_type | color << 3 (0 = empty), colors follow python-chess (BLACK=0, WHITE=1)
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(1, 7)
+WHITE, BLACK = chess.WHITE, chess.BLACK
+
+# Moves -> 16-bit integer: from | to << 6 | promotion << 12 (0 = no move)
+NO_MOVE = 0
+
+def encode_move(move):
+    if not move: return NO_MOVE
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+def decode_move(code):
+    if code == NO_MOVE: return None
+    promotion = code >> 12
+    return chess.Move(code & 63, (code >> 6) & 63, promotion if promotion else None)
+
+# Precomputed Attack Tables -> Shared with python-chess (built once at import)
+KNIGHT_ATTACKS = chess.BB_KNIGHT_ATTACKS
+KING_ATTACKS = chess.BB_KING_ATTACKS
+PAWN_ATTACKS = chess.BB_PAWN_ATTACKS # [color][square]
+RANK_MASKS, RANK_ATTACKS = chess.BB_RANK_MASKS, chess.BB_RANK_ATTACKS
+FILE_MASKS, FILE_ATTACKS = chess.BB_FILE_MASKS, chess.BB_FILE_ATTACKS
+DIAG_MASKS, DIAG_ATTACKS = chess.BB_DIAG_MASKS, chess.BB_DIAG_ATTACKS
+
+BB_ALL = chess.BB_ALL
+BB_FILE_A = chess.BB_FILE_A
+BB_FILE_H = chess.BB_FILE_H
+BB_RANK_1, BB_RANK_3, BB_RANK_6, BB_RANK_8 = chess.BB_RANK_1, chess.BB_RANK_3, chess.BB_RANK_6, chess.BB_RANK_8
+
+def rook_attacks(sq, occupied):
+    return RANK_ATTACKS[sq][RANK_MASKS[sq] & occupied] | FILE_ATTACKS[sq][FILE_MASKS[sq] & occupied]
+
+def bishop_attacks(sq, occupied):
+    return DIAG_ATTACKS[sq][DIAG_MASKS[sq] & occupied]
+
+# Castling -> Rights bitmask (1 = white O-O, 2 = white O-O-O, 4 = black O-O, 8 = black O-O-O)
+CASTLING_KEYS = [0] * 16
+for _rights in range(16):
+    for _bit in range(4):
+        if _rights & (1 << _bit):
+            CASTLING_KEYS[_rights] ^= ZOBRIST[768 + _bit]
+
+# Rights that survive a move touching a square (king/rook moves or rook captures)
+CASTLING_MASK = [15] * 64
+CASTLING_MASK[chess.E1] = 15 & ~3
+CASTLING_MASK[chess.H1] = 15 & ~1
+CASTLING_MASK[chess.A1] = 15 & ~2
+CASTLING_MASK[chess.E8] = 15 & ~12
+CASTLING_MASK[chess.H8] = 15 & ~4
+CASTLING_MASK[chess.A8] = 15 & ~8
+
+# King from/to -> (rook from, rook to)
+CASTLING_ROOKS = {
+    (chess.E1, chess.G1): (chess.H1, chess.F1),
+    (chess.E1, chess.C1): (chess.A1, chess.D1),
+    (chess.E8, chess.G8): (chess.H8, chess.F8),
+    (chess.E8, chess.C8): (chess.A8, chess.D8),
+}
+
+EP_KEYS = [ZOBRIST[772 + (sq & 7)] for sq in range(64)]
+PROMOTIONS = (QUEEN, KNIGHT, ROOK, BISHOP)
+
+# Static Exchange Evaluation -> [piece_type] -> value (same scale as the search's MVV-LVA values)
+SEE_VALUES = (0, 100, 320, 330, 500, 900, 20000)
+
+class SearchBoard:
+    """
+    Compact bitboard position used by the search.
+    Build it from a chess.Board at the root with `from_board`, then use push/pop with integer moves.
+    """
+    def __init__(self):
+        self.pieces = [0] * 7 # [piece_type] -> bitboard (both colors)
+        self.occ = [0, 0] # [color] -> bitboard
+        self.occupied = 0
+        self.squares = [0] * 64 # Mailbox: square -> piece code
+        self.king_sq = [0, 0] # [color] -> king square
+        self.turn = WHITE
+        self.castling = 0
+        self.ep_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.key = 0 # Polyglot-compatible Zobrist key, updated incrementally
+        self.stack = [] # Undo records: (move, captured, castling, ep_square, halfmove_clock, key)
+        self.keys = [] # Hash history: keys of every earlier position (game history, then the search path), oldest first
+        self.nulls = [] # len(keys) after each null move on the stack (repetitions never reach across one)
+
+    # Root Conversion
+    @classmethod
+    def from_board(cls, board):
+        sb = cls()
+        for sq, piece in board.piece_map().items():
+            sb._put(sq, piece.piece_type | (piece.color << 3))
+        sb.turn = board.turn
+        rights = board.clean_castling_rights()
+        sb.castling = ((1 if rights & chess.BB_H1 else 0) | (2 if rights & chess.BB_A1 else 0)
+                       | (4 if rights & chess.BB_H8 else 0) | (8 if rights & chess.BB_A8 else 0))
+        sb.ep_square = board.ep_square
+        sb.halfmove_clock = board.halfmove_clock
+        sb.fullmove_number = board.fullmove_number
+        sb.key = sb.compute_key()
+
+        # Game history -> keys of earlier positions, so repetitions across the root are seen
+        if board.move_stack:
+            replay = board.copy()
+            while replay.move_stack:
+                replay.pop()
+                sb.keys.append(chess.polyglot.zobrist_hash(replay))
+            sb.keys.reverse()
+        return sb
+
+    def to_board(self):
+        board = chess.Board.empty()
+        for sq in range(64):
+            code = self.squares[sq]
+            if code:
+                board.set_piece_at(sq, chess.Piece(code & 7, bool(code >> 3)))
+        board.turn = self.turn
+        rights = 0
+        if self.castling & 1: rights |= chess.BB_H1
+        if self.castling & 2: rights |= chess.BB_A1
+        if self.castling & 4: rights |= chess.BB_H8
+        if self.castling & 8: rights |= chess.BB_A8
+        board.castling_rights = rights
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        return board
+
+    def fen(self):
+        return self.to_board().fen()
+
+    def compute_key(self):
+        key = CASTLING_KEYS[self.castling]
+        for sq in range(64):
+            code = self.squares[sq]
+            if code:
+                key ^= PIECE_KEYS[code >> 3][code & 7][sq]
+        if self.turn:
+            key ^= TURN_KEY
+        if self._ep_capturable():
+            key ^= EP_KEYS[self.ep_square]
+        return key
+
+    # Polyglot only hashes the en passant square if a pawn of the side to move can take
+    def _ep_capturable(self):
+        ep = self.ep_square
+        return ep is not None and bool(PAWN_ATTACKS[not self.turn][ep] & self.pieces[PAWN] & self.occ[self.turn])
+
+    def _put(self, sq, code):
+        b = 1 << sq
+        self.pieces[code & 7] |= b
+        self.occ[code >> 3] |= b
+        self.occupied |= b
+        self.squares[sq] = code
+        if code & 7 == KING:
+            self.king_sq[code >> 3] = sq
+
+    # Queries
+    def piece_type_at(self, sq):
+        return self.squares[sq] & 7
+
+    def color_at(self, sq):
+        code = self.squares[sq]
+        return bool(code >> 3) if code else None
+
+    def king(self, color):
+        return self.king_sq[color]
+
+    def pieces_mask(self, piece_type, color):
+        return self.pieces[piece_type] & self.occ[color]
+
+    def is_capture(self, move):
+        to_sq = (move >> 6) & 63
+        if self.squares[to_sq]: return True
+        return to_sq == self.ep_square and self.squares[move & 63] & 7 == PAWN
+
+    def is_en_passant(self, move):
+        to_sq = (move >> 6) & 63
+        return to_sq == self.ep_square and self.squares[move & 63] & 7 == PAWN and (to_sq - (move & 63)) & 7 != 0
+
+    def is_castling(self, move):
+        return self.squares[move & 63] & 7 == KING and abs(((move >> 6) & 63) - (move & 63)) == 2
+
+    # Attacks
+    def attackers(self, color, sq, occupied=None):
+        """Bitboard of `color` pieces attacking `sq`."""
+        if occupied is None: occupied = self.occupied
+        pieces = self.pieces
+        rooks = pieces[ROOK] | pieces[QUEEN]
+        bishops = pieces[BISHOP] | pieces[QUEEN]
+        return ((KNIGHT_ATTACKS[sq] & pieces[KNIGHT])
+                | (KING_ATTACKS[sq] & pieces[KING])
+                | (PAWN_ATTACKS[not color][sq] & pieces[PAWN])
+                | (rook_attacks(sq, occupied) & rooks)
+                | (bishop_attacks(sq, occupied) & bishops)) & self.occ[color] & occupied
+
+    def is_attacked(self, sq, by):
+        pieces = self.pieces
+        them = self.occ[by]
+        if KNIGHT_ATTACKS[sq] & pieces[KNIGHT] & them: return True
+        if PAWN_ATTACKS[not by][sq] & pieces[PAWN] & them: return True
+        if KING_ATTACKS[sq] & pieces[KING] & them: return True
+        occupied = self.occupied
+        if rook_attacks(sq, occupied) & (pieces[ROOK] | pieces[QUEEN]) & them: return True
+        if bishop_attacks(sq, occupied) & (pieces[BISHOP] | pieces[QUEEN]) & them: return True
+        return False
+
+    # Static Exchange Evaluation -> Swap list over attacker bitboards (x-rays revealed as pieces leave), no make/unmake
+    def see_ge(self, move, threshold=0):
+        """True if the exchange started by `move` on its target square wins at least `threshold` (pins ignored)."""
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        promotion = move >> 12
+        squares = self.squares
+        mover = squares[from_sq] & 7
+        if mover == KING and abs(to_sq - from_sq) == 2:
+            return threshold <= 0 # Castling never captures
+
+        occupied = self.occupied ^ (1 << from_sq)
+        if mover == PAWN and to_sq == self.ep_square and (to_sq - from_sq) & 7:
+            swap = SEE_VALUES[PAWN] - threshold
+            occupied ^= 1 << (to_sq + (-8 if self.turn else 8)) # Captured pawn is beside the target square
+        else:
+            swap = SEE_VALUES[squares[to_sq] & 7] - threshold
+        if promotion:
+            swap += SEE_VALUES[promotion] - SEE_VALUES[PAWN]
+            mover = promotion
+        if swap < 0: return False
+
+        # Opponent recaptures the moved piece: even losing it we are still above the threshold?
+        swap = SEE_VALUES[mover] - swap
+        if swap <= 0: return True
+
+        occupied |= 1 << to_sq
+        pieces = self.pieces
+        occ = self.occ
+        bishops = pieces[BISHOP] | pieces[QUEEN]
+        rooks = pieces[ROOK] | pieces[QUEEN]
+        attackers = ((KNIGHT_ATTACKS[to_sq] & pieces[KNIGHT])
+                     | (KING_ATTACKS[to_sq] & pieces[KING])
+                     | (PAWN_ATTACKS[WHITE][to_sq] & pieces[PAWN] & occ[BLACK])
+                     | (PAWN_ATTACKS[BLACK][to_sq] & pieces[PAWN] & occ[WHITE])
+                     | (rook_attacks(to_sq, occupied) & rooks)
+                     | (bishop_attacks(to_sq, occupied) & bishops))
+        stm = self.turn
+        result = 1 # 1 = the side that made `move` reaches the threshold
+
+        while True:
+            stm = not stm
+            attackers &= occupied
+            stm_attackers = attackers & occ[stm]
+            if not stm_attackers:
+                break
+            result ^= 1
+
+            # Least valuable attacker
+            for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+                bb = stm_attackers & pieces[piece_type]
+                if bb: break
+            if piece_type == KING:
+                # The king can only take if the other side has nothing left to recapture with
+                return bool(result ^ 1) if attackers & ~occ[stm] else bool(result)
+
+            swap = SEE_VALUES[piece_type] - swap
+            if swap < result:
+                break
+            occupied ^= bb & -bb
+
+            # X-rays -> Sliders behind the piece that just left
+            if piece_type == PAWN or piece_type == BISHOP:
+                attackers |= bishop_attacks(to_sq, occupied) & bishops
+            elif piece_type == ROOK:
+                attackers |= rook_attacks(to_sq, occupied) & rooks
+            elif piece_type == QUEEN:
+                attackers |= (bishop_attacks(to_sq, occupied) & bishops) | (rook_attacks(to_sq, occupied) & rooks)
+
+        return bool(result)
+
+    def is_check(self):
+        return self.is_attacked(self.king_sq[self.turn], not self.turn)
+
+    # Legal only if the side that just moved did not leave its king attacked
+    def was_legal(self):
+        return not self.is_attacked(self.king_sq[not self.turn], self.turn)
+
+    # Make/Unmake
+    def push(self, move):
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        promotion = move >> 12
+        squares = self.squares
+        pieces = self.pieces
+        occ = self.occ
+        us = self.turn
+        them = not us
+        code = squares[from_sq]
+        piece_type = code & 7
+        captured = squares[to_sq]
+        key = self.key
+
+        self.stack.append((move, captured, self.castling, self.ep_square, self.halfmove_clock, key))
+        self.keys.append(key)
+
+        if self._ep_capturable():
+            key ^= EP_KEYS[self.ep_square]
+        key ^= TURN_KEY
+        our_keys = PIECE_KEYS[us]
+
+        from_bb = 1 << from_sq
+        to_bb = 1 << to_sq
+        self.halfmove_clock += 1
+
+        # Capture -> Remove the victim first
+        if captured:
+            cap_type = captured & 7
+            pieces[cap_type] ^= to_bb
+            occ[them] ^= to_bb
+            self.occupied ^= to_bb
+            key ^= PIECE_KEYS[them][cap_type][to_sq]
+            self.halfmove_clock = 0
+        elif piece_type == PAWN and to_sq == self.ep_square:
+            cap_sq = to_sq ^ 8
+            cap_bb = 1 << cap_sq
+            pieces[PAWN] ^= cap_bb
+            occ[them] ^= cap_bb
+            self.occupied ^= cap_bb
+            squares[cap_sq] = 0
+            key ^= PIECE_KEYS[them][PAWN][cap_sq]
+
+        # Move the piece (promotion swaps the piece type on arrival)
+        move_bb = from_bb | to_bb
+        occ[us] ^= move_bb
+        self.occupied ^= from_bb
+        self.occupied |= to_bb
+        squares[from_sq] = 0
+        key ^= our_keys[piece_type][from_sq]
+        if promotion:
+            pieces[PAWN] ^= from_bb
+            pieces[promotion] |= to_bb
+            squares[to_sq] = promotion | (us << 3)
+            key ^= our_keys[promotion][to_sq]
+        else:
+            pieces[piece_type] ^= move_bb
+            squares[to_sq] = code
+            key ^= our_keys[piece_type][to_sq]
+
+        self.ep_square = None
+        if piece_type == PAWN:
+            self.halfmove_clock = 0
+            if to_sq - from_sq == 16 or from_sq - to_sq == 16:
+                self.ep_square = (from_sq + to_sq) >> 1
+        elif piece_type == KING:
+            self.king_sq[us] = to_sq
+            if to_sq - from_sq == 2 or from_sq - to_sq == 2:
+                rook_from, rook_to = CASTLING_ROOKS[(from_sq, to_sq)]
+                rook_bb = (1 << rook_from) | (1 << rook_to)
+                pieces[ROOK] ^= rook_bb
+                occ[us] ^= rook_bb
+                self.occupied ^= rook_bb
+                squares[rook_to] = squares[rook_from]
+                squares[rook_from] = 0
+                key ^= our_keys[ROOK][rook_from] ^ our_keys[ROOK][rook_to]
+
+        castling = self.castling
+        if castling:
+            new_castling = castling & CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+            if new_castling != castling:
+                key ^= CASTLING_KEYS[castling] ^ CASTLING_KEYS[new_castling]
+                self.castling = new_castling
+
+        if not us:
+            self.fullmove_number += 1
+        self.turn = them
+        if self.ep_square is not None and self._ep_capturable():
+            key ^= EP_KEYS[self.ep_square]
+        self.key = key
+
+    def pop(self):
+        move, captured, self.castling, self.ep_square, self.halfmove_clock, self.key = self.stack.pop()
+        self.keys.pop()
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        promotion = move >> 12
+        squares = self.squares
+        pieces = self.pieces
+        occ = self.occ
+        them = self.turn
+        us = not them
+        self.turn = us
+        if not us:
+            self.fullmove_number -= 1
+
+        code = squares[to_sq]
+        piece_type = code & 7
+        from_bb = 1 << from_sq
+        to_bb = 1 << to_sq
+        move_bb = from_bb | to_bb
+
+        # Move the piece back (promotions turn back into a pawn)
+        occ[us] ^= move_bb
+        if promotion:
+            pieces[promotion] ^= to_bb
+            pieces[PAWN] |= from_bb
+            squares[from_sq] = PAWN | (us << 3)
+            piece_type = PAWN
+        else:
+            pieces[piece_type] ^= move_bb
+            squares[from_sq] = code
+        squares[to_sq] = captured
+        self.occupied ^= move_bb
+
+        if captured:
+            cap_type = captured & 7
+            pieces[cap_type] |= to_bb
+            occ[them] |= to_bb
+            self.occupied |= to_bb
+        elif piece_type == PAWN and to_sq == self.ep_square:
+            cap_sq = to_sq ^ 8
+            cap_bb = 1 << cap_sq
+            pieces[PAWN] |= cap_bb
+            occ[them] |= cap_bb
+            self.occupied |= cap_bb
+            squares[cap_sq] = PAWN | (them << 3)
+        elif piece_type == KING and (to_sq - from_sq == 2 or from_sq - to_sq == 2):
+            rook_from, rook_to = CASTLING_ROOKS[(from_sq, to_sq)]
+            rook_bb = (1 << rook_from) | (1 << rook_to)
+            pieces[ROOK] ^= rook_bb
+            occ[us] ^= rook_bb
+            self.occupied ^= rook_bb
+            squares[rook_from] = squares[rook_to]
+            squares[rook_to] = 0
+        if piece_type == KING:
+            self.king_sq[us] = from_sq
+
+    def push_null(self):
+        self.stack.append((NO_MOVE, 0, self.castling, self.ep_square, self.halfmove_clock, self.key))
+        self.keys.append(self.key)
+        self.nulls.append(len(self.keys))
+        key = self.key ^ TURN_KEY
+        if self._ep_capturable():
+            key ^= EP_KEYS[self.ep_square]
+        self.ep_square = None
+        self.halfmove_clock += 1
+        self.turn = not self.turn
+        self.key = key
+
+    def pop_null(self):
+        _, _, self.castling, self.ep_square, self.halfmove_clock, self.key = self.stack.pop()
+        self.keys.pop()
+        self.nulls.pop()
+        self.turn = not self.turn
+
+    # Move Generation (pseudo-legal, check legality with push + was_legal)
+    def generate_moves(self):
+        moves = self.generate_captures()
+        moves.extend(self.generate_quiets())
+        return moves
+
+    def generate_captures(self):
+        """Captures, en passant and all promotions."""
+        moves = []
+        us = self.turn
+        own = self.occ[us]
+        enemy = self.occ[not us]
+        occupied = self.occupied
+        pieces = self.pieces
+        squares_empty = ~occupied & BB_ALL
+
+        # Pawns
+        pawns = pieces[PAWN] & own
+        if us:
+            promo_rank = BB_RANK_8
+            left = ((pawns & ~BB_FILE_A) << 7) & enemy
+            right = ((pawns & ~BB_FILE_H) << 9) & enemy
+            pushes = (pawns << 8) & squares_empty & promo_rank
+            left_off, right_off, push_off = 7, 9, 8
+        else:
+            promo_rank = BB_RANK_1
+            left = (pawns & ~BB_FILE_A) >> 9 & enemy
+            right = (pawns & ~BB_FILE_H) >> 7 & enemy
+            pushes = (pawns >> 8) & squares_empty & promo_rank
+            left_off, right_off, push_off = -9, -7, -8
+
+        for targets, offset in ((left, left_off), (right, right_off), (pushes, push_off)):
+            while targets:
+                b = targets & -targets
+                to_sq = b.bit_length() - 1
+                targets ^= b
+                move = (to_sq - offset) | (to_sq << 6)
+                if b & promo_rank:
+                    for promotion in PROMOTIONS:
+                        moves.append(move | (promotion << 12))
+                else:
+                    moves.append(move)
+
+        if self.ep_square is not None:
+            ep = self.ep_square
+            attackers = PAWN_ATTACKS[not us][ep] & pawns
+            while attackers:
+                b = attackers & -attackers
+                attackers ^= b
+                moves.append((b.bit_length() - 1) | (ep << 6))
+
+        # Pieces
+        self._piece_moves(moves, enemy)
+        return moves
+
+    def generate_quiets(self):
+        """Non-capturing, non-promoting moves (including castling)."""
+        moves = []
+        us = self.turn
+        own = self.occ[us]
+        occupied = self.occupied
+        squares_empty = ~occupied & BB_ALL
+        pawns = self.pieces[PAWN] & own
+
+        if us:
+            single = (pawns << 8) & squares_empty & ~BB_RANK_8
+            double = ((single & BB_RANK_3) << 8) & squares_empty
+            offset = 8
+        else:
+            single = (pawns >> 8) & squares_empty & ~BB_RANK_1
+            double = ((single & BB_RANK_6) >> 8) & squares_empty
+            offset = -8
+
+        while single:
+            b = single & -single
+            to_sq = b.bit_length() - 1
+            single ^= b
+            moves.append((to_sq - offset) | (to_sq << 6))
+        while double:
+            b = double & -double
+            to_sq = b.bit_length() - 1
+            double ^= b
+            moves.append((to_sq - 2 * offset) | (to_sq << 6))
+
+        self._piece_moves(moves, squares_empty)
+        if self.castling:
+            self._castling_moves(moves)
+        return moves
+
+    # Castling -> Path empty and king does not start in, pass through or land on an attacked square
+    def _castling_moves(self, moves):
+        castling = self.castling
+        occupied = self.occupied
+        us = self.turn
+        if castling:
+            them = not us
+            if us:
+                if castling & 1 and not occupied & (chess.BB_F1 | chess.BB_G1) \
+                        and not self.is_attacked(chess.E1, them) and not self.is_attacked(chess.F1, them) and not self.is_attacked(chess.G1, them):
+                    moves.append(chess.E1 | (chess.G1 << 6))
+                if castling & 2 and not occupied & (chess.BB_B1 | chess.BB_C1 | chess.BB_D1) \
+                        and not self.is_attacked(chess.E1, them) and not self.is_attacked(chess.D1, them) and not self.is_attacked(chess.C1, them):
+                    moves.append(chess.E1 | (chess.C1 << 6))
+            else:
+                if castling & 4 and not occupied & (chess.BB_F8 | chess.BB_G8) \
+                        and not self.is_attacked(chess.E8, them) and not self.is_attacked(chess.F8, them) and not self.is_attacked(chess.G8, them):
+                    moves.append(chess.E8 | (chess.G8 << 6))
+                if castling & 8 and not occupied & (chess.BB_B8 | chess.BB_C8 | chess.BB_D8) \
+                        and not self.is_attacked(chess.E8, them) and not self.is_attacked(chess.D8, them) and not self.is_attacked(chess.C8, them):
+                    moves.append(chess.E8 | (chess.C8 << 6))
+
+    # Knight/Bishop/Rook/Queen/King moves onto `target` squares
+    def _piece_moves(self, moves, target):
+        us = self.turn
+        own = self.occ[us]
+        occupied = self.occupied
+        pieces = self.pieces
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            bb = pieces[piece_type] & own
+            while bb:
+                b = bb & -bb
+                from_sq = b.bit_length() - 1
+                bb ^= b
+                if piece_type == KNIGHT:
+                    attacks = KNIGHT_ATTACKS[from_sq]
+                elif piece_type == BISHOP:
+                    attacks = bishop_attacks(from_sq, occupied)
+                elif piece_type == ROOK:
+                    attacks = rook_attacks(from_sq, occupied)
+                elif piece_type == QUEEN:
+                    attacks = rook_attacks(from_sq, occupied) | bishop_attacks(from_sq, occupied)
+                else:
+                    attacks = KING_ATTACKS[from_sq]
+                attacks &= target
+                while attacks:
+                    a = attacks & -attacks
+                    attacks ^= a
+                    moves.append(from_sq | ((a.bit_length() - 1) << 6))
+
+    def is_pseudo_legal(self, move):
+        """True if `move` would be generated in this position (checks TT moves and killers from other positions)."""
+        if move == NO_MOVE: return False
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        promotion = move >> 12
+        piece = self.squares[from_sq]
+        us = self.turn
+        if not piece or piece >> 3 != us: return False
+        to_bb = 1 << to_sq
+        if self.occ[us] & to_bb: return False
+
+        piece_type = piece & 7
+        if piece_type == PAWN:
+            if bool(to_bb & (BB_RANK_8 | BB_RANK_1)) != (promotion in PROMOTIONS): return False
+            if to_bb & PAWN_ATTACKS[us][from_sq]:
+                return bool(to_bb & self.occ[not us]) or to_sq == self.ep_square
+            if to_bb & self.occupied: return False
+            step = 8 if us else -8
+            if to_sq == from_sq + step: return True
+            start_rank = 1 if us else 6
+            return to_sq == from_sq + 2 * step and from_sq >> 3 == start_rank and not self.occupied & (1 << (from_sq + step))
+        if promotion: return False
+
+        if piece_type == KNIGHT:
+            attacks = KNIGHT_ATTACKS[from_sq]
+        elif piece_type == BISHOP:
+            attacks = bishop_attacks(from_sq, self.occupied)
+        elif piece_type == ROOK:
+            attacks = rook_attacks(from_sq, self.occupied)
+        elif piece_type == QUEEN:
+            attacks = rook_attacks(from_sq, self.occupied) | bishop_attacks(from_sq, self.occupied)
+        else:
+            if to_sq - from_sq in (2, -2):
+                castles = []
+                self._castling_moves(castles)
+                return move in castles
+            attacks = KING_ATTACKS[from_sq]
+        return bool(attacks & to_bb)
+
+    def legal_moves(self):
+        moves = []
+        for move in self.generate_moves():
+            self.push(move)
+            if self.was_legal():
+                moves.append(move)
+            self.pop()
+        return moves
+
+    def has_legal_moves(self):
+        for move in self.generate_moves():
+            self.push(move)
+            legal = self.was_legal()
+            self.pop()
+            if legal: return True
+        return False
+
+    # Draw Rules
+    def is_repetition(self, count=3):
+        """Position occurred `count` times (game history + search path)."""
+        key = self.key
+        keys = self.keys
+        n = len(keys)
+        # Only positions since the last irreversible move (pawn move, capture, null move) can repeat,
+        # and only every other one has the same side to move
+        stop = n - self.halfmove_clock
+        if self.nulls and self.nulls[-1] > stop:
+            stop = self.nulls[-1]
+        seen = 1
+        for i in range(n - 2, max(stop, 0) - 1, -2):
+            if keys[i] == key:
+                seen += 1
+                if seen >= count: return True
+        return False
+
+    def is_fifty_moves(self):
+        return self.halfmove_clock >= 100
+
+    def is_insufficient_material(self):
+        pieces = self.pieces
+        if pieces[PAWN] or pieces[ROOK] or pieces[QUEEN]: return False
+        # Only kings plus at most one minor piece
+        return (pieces[KNIGHT] | pieces[BISHOP]).bit_count() <= 1
@@ -6,6 +6,7 @@ import numpy as np
 import logging
 import os
 import random
+from engines.bot.bitboard import SearchBoard, KING, PAWN, ROOK, CASTLING_ROOKS
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +77,11 @@ def get_halfkp_features(board: chess.Board, perspective=None):
     """
     Generate HalfKP features for the given board.
     If perspective is None, uses board.turn.
+    Accepts a chess.Board or the search's SearchBoard.
     """
+    if isinstance(board, SearchBoard):
+        return _get_halfkp_features_sb(board, perspective)
+
     active_indices = []
     
     turn = board.turn if perspective is None else perspective
@@ -114,22 +119,16 @@ def get_halfkp_features(board: chess.Board, perspective=None):
 def get_feature_deltas(board: chess.Board, move: chess.Move):
     """
     Returns (added, removed) indices for both perspectives.
-    Returns None if full recompute is needed (e.g. King move).
+    King moves (incl. castling) invalidate the mover's perspective: its added/removed entries are None
+    (refresh needed), while the opponent's perspective is still updated incrementally.
     
     Returns: (added_white, removed_white, added_black, removed_black)
+    Accepts a chess.Board + chess.Move, or a SearchBoard + integer move.
     """
-    # Check for King move
+    if isinstance(board, SearchBoard):
+        return _get_feature_deltas_sb(board, move)
+
     piece = board.piece_at(move.from_square)
-    if piece.piece_type == chess.KING:
-        return None # Full recompute needed for the side moving the king
-        # Actually, if White King moves, White features need recompute.
-        # Black features (opponent King) only need incremental update for the moving piece.
-        # But for simplicity, let's return None to force full recompute of everything or handle separately.
-        # Let's return None for simplicity.
-        
-    # Check for Castling (King move involved)
-    if board.is_castling(move):
-        return None
 
     added_w, removed_w = [], []
     added_b, removed_b = [], []
@@ -187,5 +186,83 @@ def get_feature_deltas(board: chess.Board, move: chess.Move):
             idx_b = get_idx(cap_sq, captured_piece, chess.BLACK)
             if idx_w != -1: removed_w.append(idx_w)
             if idx_b != -1: removed_b.append(idx_b)
+
+    # 4. Handle King moves -> Castling also moves the rook, mover's perspective needs a refresh
+    if piece.piece_type == chess.KING:
+        if board.is_castling(move):
+            rook_from, rook_to = CASTLING_ROOKS[(move.from_square, move.to_square)]
+            rook = chess.Piece(chess.ROOK, piece.color)
+            removed_w.append(get_idx(rook_from, rook, chess.WHITE))
+            removed_b.append(get_idx(rook_from, rook, chess.BLACK))
+            added_w.append(get_idx(rook_to, rook, chess.WHITE))
+            added_b.append(get_idx(rook_to, rook, chess.BLACK))
+        if piece.color == chess.WHITE:
+            added_w, removed_w = None, None
+        else:
+            added_b, removed_b = None, None
             
     return (added_w, removed_w, added_b, removed_b)
+
+# SearchBoard Fast Paths -> Same feature indices, read straight from the mailbox (no chess.Piece objects)
+def _get_halfkp_features_sb(board, perspective=None):
+    us = board.turn if perspective is None else perspective
+    flip = 0 if us == chess.WHITE else 56
+    k_base = (board.king_sq[us] ^ flip) * 640
+    squares = board.squares
+    own_king = KING | (us << 3)
+
+    active_indices = []
+    occupied = board.occupied
+    while occupied:
+        b = occupied & -occupied
+        sq = b.bit_length() - 1
+        occupied ^= b
+        code = squares[sq]
+        if code == own_king:
+            continue
+        pt_idx = (code & 7) - 1 if (code >> 3) == us else (code & 7) + 4
+        active_indices.append(k_base + (sq ^ flip) * 10 + pt_idx)
+    return active_indices
+
+def _get_feature_deltas_sb(board, move):
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    squares = board.squares
+    code = squares[from_sq]
+    piece_type = code & 7
+    color = code >> 3
+    new_type = (move >> 12) or piece_type
+    k_w = board.king_sq[chess.WHITE] * 640
+    k_b = (board.king_sq[chess.BLACK] ^ 56) * 640
+
+    # White perspective: our pieces are white; black perspective: ranks flipped
+    w_off = 0 if color else 5
+    b_off = 5 if color else 0
+    removed_w = [k_w + from_sq * 10 + piece_type - 1 + w_off]
+    removed_b = [k_b + (from_sq ^ 56) * 10 + piece_type - 1 + b_off]
+    added_w = [k_w + to_sq * 10 + new_type - 1 + w_off]
+    added_b = [k_b + (to_sq ^ 56) * 10 + new_type - 1 + b_off]
+
+    captured = squares[to_sq]
+    cap_sq = to_sq
+    if not captured and piece_type == PAWN and to_sq == board.ep_square:
+        cap_sq = to_sq ^ 8
+        captured = squares[cap_sq]
+    if captured:
+        cap_type = captured & 7
+        removed_w.append(k_w + cap_sq * 10 + cap_type - 1 + (0 if captured >> 3 else 5))
+        removed_b.append(k_b + (cap_sq ^ 56) * 10 + cap_type - 1 + (5 if captured >> 3 else 0))
+
+    # King move -> Castling also moves the rook, mover's perspective needs a refresh
+    if piece_type == KING:
+        if to_sq - from_sq == 2 or from_sq - to_sq == 2:
+            rook_from, rook_to = CASTLING_ROOKS[(from_sq, to_sq)]
+            removed_w.append(k_w + rook_from * 10 + ROOK - 1 + w_off)
+            removed_b.append(k_b + (rook_from ^ 56) * 10 + ROOK - 1 + b_off)
+            added_w.append(k_w + rook_to * 10 + ROOK - 1 + w_off)
+            added_b.append(k_b + (rook_to ^ 56) * 10 + ROOK - 1 + b_off)
+        if color:
+            return (None, None, added_b, removed_b)
+        return (added_w, removed_w, None, None)
+
+    return (added_w, removed_w, added_b, removed_b)
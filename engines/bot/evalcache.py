@@ -0,0 +1,49 @@
+import numpy as np
+
+ENTRY_BYTES = 16 # key (8) + score (8)
+
+class EvalCache:
+    """
+    Fixed-size, direct-mapped cache of static evaluations, keyed by the position's Zobrist key.
+    Separate from the transposition table: every evaluated node is worth keeping here, searched or not,
+    and a slot is simply overwritten by the newest position that maps to it.
+    """
+    def __init__(self, size_mb=4):
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        # Round down to a power of two -> index with a mask instead of a modulo
+        entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.size = 1 << (entries.bit_length() - 1)
+        self.mask = self.size - 1
+        self.size_mb = size_mb
+        self.keys = np.zeros(self.size, dtype=np.uint64)
+        self.scores = np.zeros(self.size, dtype=np.float64) # float64 -> a hit returns exactly the computed score
+        self.reset_stats()
+
+    # New game -> Forget every entry (scores only depend on the position, but old games just waste slots)
+    def clear(self):
+        self.keys.fill(0)
+        self.scores.fill(0)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+
+    # Probe -> Returns the cached score, or None on a miss
+    def probe(self, key):
+        self.probes += 1
+        i = key & self.mask
+        if int(self.keys[i]) != key: return None
+        self.hits += 1
+        return float(self.scores[i])
+
+    # Store -> Always replace
+    def store(self, key, score):
+        i = key & self.mask
+        self.keys[i] = key
+        self.scores[i] = score
+
+    def hit_rate(self):
+        return 100.0 * self.hits / self.probes if self.probes else 0.0
@@ -0,0 +1,73 @@
+import numpy as np
+
+BATCH_ROWS = 64 # Initial batch capacity (grown on demand)
+
+class NumpyNNUE:
+    """
+    Inference-only NNUE backend for the search (torch stays for training).
+    Holds the l1/output weights as contiguous float32 NumPy arrays and runs the fused
+    concat -> ReLU -> matvec -> ReLU -> dot path into preallocated buffers, without the torch dispatcher.
+    """
+    def __init__(self, model):
+        # Feature transformer rows (shared memory with the torch module, used by the accumulators)
+        self.feature_weights = model.feature_transformer.weight.detach().numpy()
+        hidden_dim = self.feature_weights.shape[1]
+
+        # l1 split into the "us" and "them" halves -> concat([us, them]) @ W.T == W_us @ us + W_them @ them
+        l1_weight = model.l1.weight.detach().numpy()
+        self.l1_us = np.ascontiguousarray(l1_weight[:, :hidden_dim], dtype=np.float32)
+        self.l1_them = np.ascontiguousarray(l1_weight[:, hidden_dim:], dtype=np.float32)
+        self.l1_bias = np.ascontiguousarray(model.l1.bias.detach().numpy(), dtype=np.float32)
+        self.out_weight = np.ascontiguousarray(model.output.weight.detach().numpy()[0], dtype=np.float32)
+        self.out_bias = float(model.output.bias.detach().numpy()[0])
+
+        # Preallocated buffers
+        self.x_us = np.zeros(hidden_dim, dtype=np.float32)
+        self.x_them = np.zeros(hidden_dim, dtype=np.float32)
+        self.hidden = np.zeros(self.l1_bias.shape[0], dtype=np.float32)
+        self.hidden_them = np.zeros(self.l1_bias.shape[0], dtype=np.float32)
+
+        # Batched path -> l1 transposed so [n, hidden] @ [hidden, 128] runs as one matmul
+        self.l1_us_t = np.ascontiguousarray(self.l1_us.T)
+        self.l1_them_t = np.ascontiguousarray(self.l1_them.T)
+        self._alloc_batch(BATCH_ROWS)
+
+    def _alloc_batch(self, rows):
+        hidden_dim = self.x_us.shape[0]
+        self.batch_x_us = np.zeros((rows, hidden_dim), dtype=np.float32)
+        self.batch_x_them = np.zeros((rows, hidden_dim), dtype=np.float32)
+        self.batch_hidden = np.zeros((rows, self.l1_bias.shape[0]), dtype=np.float32)
+        self.batch_hidden_them = np.zeros((rows, self.l1_bias.shape[0]), dtype=np.float32)
+        self.batch_out = np.zeros(rows, dtype=np.float32)
+
+    def forward(self, acc_us, acc_them):
+        """Score of a single position from two [hidden_dim] accumulators (side to move first)."""
+        x_us, x_them, hidden = self.x_us, self.x_them, self.hidden
+        np.maximum(acc_us, 0, out=x_us)
+        np.maximum(acc_them, 0, out=x_them)
+        np.dot(self.l1_us, x_us, out=hidden)
+        np.dot(self.l1_them, x_them, out=self.hidden_them)
+        hidden += self.hidden_them
+        hidden += self.l1_bias
+        np.maximum(hidden, 0, out=hidden)
+        return float(np.dot(self.out_weight, hidden)) + self.out_bias
+
+    def forward_batch(self, acc_us, acc_them):
+        """Scores of n positions from two [n, hidden_dim] accumulator matrices (side to move first), as an [n] view."""
+        n = acc_us.shape[0]
+        if n > self.batch_out.shape[0]:
+            self._alloc_batch(max(n, 2 * self.batch_out.shape[0]))
+        x_us, x_them = self.batch_x_us[:n], self.batch_x_them[:n]
+        hidden, hidden_them = self.batch_hidden[:n], self.batch_hidden_them[:n]
+        out = self.batch_out[:n]
+
+        np.maximum(acc_us, 0, out=x_us)
+        np.maximum(acc_them, 0, out=x_them)
+        np.matmul(x_us, self.l1_us_t, out=hidden)
+        np.matmul(x_them, self.l1_them_t, out=hidden_them)
+        hidden += hidden_them
+        hidden += self.l1_bias
+        np.maximum(hidden, 0, out=hidden)
+        np.matmul(hidden, self.out_weight, out=out)
+        out += self.out_bias
+        return out
@@ -1,10 +1,51 @@
+import threading
 import chess
-from engines.bot.search import Searcher
+import chess.engine
+from engines.bot.search import Searcher, MAX_DEPTH, TT_MB
 
-# Global Instance
+# Global Instance -> Shared by every caller (the server runs sync routes on a threadpool). The search keeps its root
+# moves, PV and stats on the instance, so one search at a time: every entry point holds `searcher_lock`
 searcher = Searcher()
+searcher_lock = threading.Lock()
 
 # Main function for getting move
-def get_move(board: chess.Board, depth=5) -> chess.Move:
+# With multipv=K, returns the top K lines instead (list of {"multipv", "move", "score", "pv", "depth"} dicts)
+# profile="cprofile"/"sample" (or BOT_PROFILE) profiles the search, see get_profile
+def get_move(board: chess.Board, depth=5, time_limit: chess.engine.Limit = None, multipv: int = None, profile: str = None):
     # Adapt simple signature to usage of Searcher
-    return searcher.get_move(board, depth=depth)
+    with searcher_lock:
+        return searcher.get_move(board, depth=depth, time_limit=time_limit, multipv=multipv, profile=profile)
+
+# Report of the last profiled search: {"collapsed": path, "table": path, "stages": {stage: seconds}}, or None
+def get_profile() -> dict:
+    with searcher_lock:
+        return searcher.last_profile
+
+# Last search as a chess.engine.InfoDict (score, depth, seldepth, nodes, nps, time, hashfull, pv), `board` = its root
+def get_info(board: chess.Board) -> chess.engine.InfoDict:
+    with searcher_lock:
+        return searcher.info(board.turn)
+
+# Starts pondering on `board` (position after our move), returns the expected reply or None
+def start_ponder(board: chess.Board) -> chess.Move:
+    with searcher_lock:
+        return searcher.start_ponder(board)
+
+def stop_ponder():
+    with searcher_lock:
+        searcher.stop_ponder()
+
+# Lazy SMP -> Number of search processes (1 = single-threaded)
+def set_threads(threads: int):
+    with searcher_lock:
+        searcher.set_threads(threads)
+
+# Transposition table size in MB (emptied on resize)
+def set_hash(size_mb: int):
+    with searcher_lock:
+        searcher.set_hash(size_mb)
+
+# Clears the search caches (TT, eval cache, heuristics) between games
+def new_game():
+    with searcher_lock:
+        searcher.new_game()
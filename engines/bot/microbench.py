@@ -0,0 +1,240 @@
+import gc
+import sys
+import json
+import math
+import time
+import argparse
+import statistics
+import contextlib
+import numpy as np
+import torch
+import chess
+from engines.bot.benchmark import BENCH_POSITIONS
+from engines.bot.bitboard import SearchBoard
+from engines.bot.dataset import get_halfkp_features, get_feature_deltas
+from engines.bot.search import Searcher
+
+# Constants & Configuration
+WARMUP_ROUNDS = 3 # Untimed rounds before measuring (caches, allocator, branch history)
+REPEAT_ROUNDS = 7 # Timed rounds, ops/sec is their median
+MIN_ROUND_TIME = 0.05 # Seconds: fast primitives repeat the corpus until one round takes at least this long
+MICRO_TT_MB = 1
+
+def measure(op, items, setup=None, ops_per_item=1, warmup=WARMUP_ROUNDS, repeat=REPEAT_ROUNDS, min_round_time=MIN_ROUND_TIME):
+    """
+    Times `op(*args)` for every args tuple in `items` and returns {"ops_per_sec" (median round), "best", "spread", "ops"}.
+    Without `setup`, a round is a tight loop over the corpus, repeated until it lasts `min_round_time`.
+    With `setup(*args)` (untimed state preparation), every call is timed on its own, minus the timer's own overhead.
+    `spread` is the rounds' relative median absolute deviation (%); the garbage collector is off while measuring.
+    """
+    def run_batch(passes):
+        start = time.perf_counter()
+        for _ in range(passes):
+            for args in items:
+                op(*args)
+        return time.perf_counter() - start
+
+    def run_setup(passes):
+        elapsed = 0.0
+        perf_counter = time.perf_counter
+        for _ in range(passes):
+            for args in items:
+                setup(*args)
+                start = perf_counter()
+                op(*args)
+                elapsed += perf_counter() - start
+        return max(elapsed - passes * len(items) * overhead, 1e-9)
+
+    if not items:
+        return {"ops_per_sec": 0.0, "best": 0.0, "spread": 0.0, "ops": 0} # e.g. no captures in a small corpus
+    run = run_batch if setup is None else run_setup
+    overhead = timer_overhead() if setup is not None else 0.0
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        passes = max(1, math.ceil(min_round_time / max(run(1), 1e-9)))
+        for _ in range(warmup):
+            run(passes)
+        rates = [passes * len(items) * ops_per_item / run(passes) for _ in range(repeat)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    median = statistics.median(rates)
+    spread = 100.0 * statistics.median(abs(r - median) for r in rates) / median
+    return {"ops_per_sec": median, "best": max(rates), "spread": spread, "ops": passes * len(items) * ops_per_item}
+
+# Timer Overhead -> Cost of one perf_counter() pair, subtracted from individually timed calls
+def timer_overhead(samples=10000):
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for _ in range(samples):
+        perf_counter() - perf_counter()
+    return (perf_counter() - start) / samples
+
+class Corpus:
+    """The bench positions in every representation the primitives take, precomputed so no conversion is timed."""
+    def __init__(self, fens, model_path=None):
+        self.boards = [chess.Board(fen) for fen in fens]
+        self.search_boards = [SearchBoard.from_board(board) for board in self.boards]
+        with contextlib.redirect_stdout(sys.stderr): # Model loading messages stay off stdout (--json)
+            self.searchers = {backend: Searcher(model_path, tt_mb=MICRO_TT_MB, backend=backend) for backend in ("numpy", "torch")}
+        self.model_loaded = self.searchers["numpy"].model_loaded
+        self.model = self.searchers["numpy"].model
+        self.nnue = self.searchers["numpy"].nnue
+        self.weights = self.nnue.feature_weights
+
+        # Moves -> Legal moves as (chess.Board, chess.Move) and (SearchBoard, int), captures as (SearchBoard, int)
+        self.moves = [(board, move) for board in self.boards for move in board.legal_moves]
+        self.sb_moves = [(sb, move) for sb in self.search_boards for move in sb.legal_moves()]
+        self.captures = [(sb, move) for sb, move in self.sb_moves if sb.is_capture(move)]
+
+        # Features -> Both perspectives of every position, and the deltas of every non-king move
+        self.features = [get_halfkp_features(sb, color) for sb in self.search_boards for color in (chess.WHITE, chess.BLACK)]
+        self.deltas = []
+        for sb, move in self.sb_moves:
+            added_w, removed_w, added_b, removed_b = get_feature_deltas(sb, move)
+            if added_w is not None and added_b is not None:
+                self.deltas += [(added_w, removed_w), (added_b, removed_b)]
+
+        # Accumulators -> [n, hidden_dim] (side to move, other side) of every position
+        us = [self.weights[get_halfkp_features(sb, sb.turn)].sum(axis=0) for sb in self.search_boards]
+        them = [self.weights[get_halfkp_features(sb, not sb.turn)].sum(axis=0) for sb in self.search_boards]
+        self.acc_us = np.ascontiguousarray(us, dtype=np.float32)
+        self.acc_them = np.ascontiguousarray(them, dtype=np.float32)
+
+# Primitives -> Each builder returns [(backend, op, items, setup, ops_per_item)], compared side by side
+def bench_halfkp_features(c):
+    return [
+        ("chess.Board", get_halfkp_features, [(b, color) for b in c.boards for color in (chess.WHITE, chess.BLACK)], None, 1),
+        ("SearchBoard", get_halfkp_features, [(sb, color) for sb in c.search_boards for color in (chess.WHITE, chess.BLACK)], None, 1),
+    ]
+
+def bench_feature_deltas(c):
+    return [
+        ("chess.Board", get_feature_deltas, c.moves, None, 1),
+        ("SearchBoard", get_feature_deltas, c.sb_moves, None, 1),
+    ]
+
+def bench_get_accumulator(c):
+    weights = c.weights
+    model = c.model
+    tensors = [(torch.tensor(f, dtype=torch.long),) for f in c.features]
+    arrays = [(np.array(f, dtype=np.int64),) for f in c.features]
+    def torch_op(indices):
+        with torch.no_grad():
+            model.get_accumulator(indices)
+    return [
+        ("torch", torch_op, tensors, None, 1),
+        ("numpy", lambda indices: weights[indices].sum(axis=0), arrays, None, 1),
+    ]
+
+def bench_update_accumulator(c):
+    model = c.model
+    stack = c.searchers["numpy"].accumulators
+    stack.views[0][0][:] = c.acc_us[0]
+    stack.views[0][1][:] = c.acc_them[0]
+    acc = torch.from_numpy(c.acc_us[0].copy())
+    tensors = [(torch.tensor(a, dtype=torch.long), torch.tensor(r, dtype=torch.long)) for a, r in c.deltas]
+    def torch_op(added, removed):
+        with torch.no_grad():
+            model.update_accumulator(acc, added, removed)
+    return [
+        ("torch", torch_op, tensors, None, 1),
+        ("AccumulatorStack", lambda added, removed: stack.update(1, chess.WHITE, added, removed), c.deltas, None, 1),
+    ]
+
+def bench_forward_network(c):
+    model = c.model
+    nnue = c.nnue
+    rows = list(zip(c.acc_us, c.acc_them))
+    tensors = [(torch.from_numpy(us).view(1, -1), torch.from_numpy(them).view(1, -1)) for us, them in rows]
+    def torch_op(us, them):
+        with torch.no_grad():
+            model.forward_network(us, them)
+    return [
+        ("torch", torch_op, tensors, None, 1),
+        ("numpy", nnue.forward, rows, None, 1),
+        ("numpy batch", nnue.forward_batch, [(c.acc_us, c.acc_them)], None, len(rows)),
+    ]
+
+# Evaluate -> Cache misses: the root accumulators are set and the position's eval cache slot is emptied (untimed)
+def bench_evaluate(c):
+    cases = []
+    for backend, searcher in c.searchers.items():
+        def setup(sb, searcher=searcher):
+            searcher.set_root_accumulators(sb)
+            searcher.eval_cache.keys[sb.key & searcher.eval_cache.mask] = 0
+        cases.append((backend, lambda sb, searcher=searcher: searcher.evaluate(sb, 0), [(sb,) for sb in c.search_boards], setup, 1))
+    return cases
+
+def bench_see_capture(c):
+    return [("SearchBoard", c.searchers["numpy"].see_capture, c.captures, None, 1)]
+
+def bench_mvv_lva(c):
+    return [("SearchBoard", c.searchers["numpy"].mvv_lva, c.captures, None, 1)]
+
+def bench_legal_moves(c):
+    return [
+        ("chess.Board", lambda board: list(board.legal_moves), [(b,) for b in c.boards], None, 1),
+        ("SearchBoard", SearchBoard.legal_moves, [(sb,) for sb in c.search_boards], None, 1),
+    ]
+
+PRIMITIVES = {
+    "get_halfkp_features": bench_halfkp_features,
+    "get_feature_deltas": bench_feature_deltas,
+    "get_accumulator": bench_get_accumulator,
+    "update_accumulator": bench_update_accumulator,
+    "forward_network": bench_forward_network,
+    "evaluate": bench_evaluate,
+    "see_capture": bench_see_capture,
+    "mvv_lva": bench_mvv_lva,
+    "legal_moves": bench_legal_moves,
+}
+
+def run_microbench(primitives=None, fens=None, model_path=None, warmup=WARMUP_ROUNDS, repeat=REPEAT_ROUNDS, min_round_time=MIN_ROUND_TIME, progress=None):
+    """
+    Measures every backend of each primitive (default: all of PRIMITIVES) over the corpus (default: the bench positions).
+    Returns {primitive: [{"backend", "ops_per_sec", "best", "spread", "ops", "relative"}]}, `relative` = speed vs the first backend.
+    A trained model is not needed: without one the searchers run on their random initial weights.
+    """
+    corpus = Corpus(fens or [fen for _, fen in BENCH_POSITIONS], model_path)
+    results = {}
+    for name in primitives or PRIMITIVES:
+        rows = []
+        for backend, op, items, setup, ops_per_item in PRIMITIVES[name](corpus):
+            row = {"backend": backend, **measure(op, items, setup, ops_per_item, warmup, repeat, min_round_time)}
+            row["relative"] = row["ops_per_sec"] / rows[0]["ops_per_sec"] if rows and rows[0]["ops_per_sec"] else 1.0
+            rows.append(row)
+            if progress:
+                progress(name, row)
+        results[name] = rows
+    return results
+
+def format_text(results):
+    lines = [f"{'primitive':<21} {'backend':<17} {'ops/sec':>12} {'best':>12} {'spread':>7} {'relative':>9}"]
+    for name, rows in results.items():
+        for i, row in enumerate(rows):
+            lines.append(f"{name if i == 0 else '':<21} {row['backend']:<17} {row['ops_per_sec']:>12,.0f} {row['best']:>12,.0f} {row['spread']:>6.1f}% {row['relative']:>8.2f}x")
+    return "\n".join(lines)
+
+# CLI -> python -m engines.bot.microbench [--only name ...] [--json] [--model path]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks: ops/sec of each NNUE and search primitive, backends side by side.")
+    parser.add_argument("--only", nargs="+", choices=list(PRIMITIVES), default=None, help="Primitives to measure (default: all)")
+    parser.add_argument("--model", default=None, help="Model path (optional, random weights otherwise)")
+    parser.add_argument("--positions", type=int, default=None, help="Only the first N bench positions")
+    parser.add_argument("--warmup", type=int, default=WARMUP_ROUNDS)
+    parser.add_argument("--repeat", type=int, default=REPEAT_ROUNDS)
+    parser.add_argument("--min-round-time", type=float, default=MIN_ROUND_TIME)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    positions = BENCH_POSITIONS[:args.positions] if args.positions else BENCH_POSITIONS
+    progress = None if args.json else lambda name, row: print(f"{name} [{row['backend']}]: {row['ops_per_sec']:,.0f} ops/sec", file=sys.stderr)
+    results = run_microbench(args.only, [fen for _, fen in positions], args.model, args.warmup, args.repeat, args.min_round_time, progress)
+    print(json.dumps(results, indent=2) if args.json else format_text(results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
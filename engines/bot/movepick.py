@@ -0,0 +1,76 @@
+import time
+
+# Stages -> Each one is generated only when the previous ones are exhausted
+TT_MOVE, GOOD_CAPTURES, KILLERS, COUNTERMOVE, QUIETS, BAD_CAPTURES = range(6)
+
+class MovePicker:
+    """
+    Staged move ordering for `pvs`. Iterating yields pseudo-legal moves in this order:
+    TT move -> good captures (MVV-LVA, SEE >= 0) -> killers -> countermove -> quiets by history -> bad captures.
+    Most nodes cut off on the TT move or a capture, so quiet generation and sorting are usually skipped entirely.
+    `stage` tells the caller which stage the last move came from.
+    """
+    def __init__(self, searcher, board, tt_move, ply):
+        self.searcher = searcher
+        self.board = board
+        self.tt_move = tt_move
+        self.ply = ply
+        self.stage = TT_MOVE
+
+    def __iter__(self):
+        searcher = self.searcher
+        board = self.board
+        tt_move = self.tt_move
+
+        # 1. TT Move -> Validated, it may come from a different position with the same index
+        if tt_move and board.is_pseudo_legal(tt_move):
+            yield tt_move
+
+        # 2. Good Captures (and promotions) by MVV-LVA, SEE checked lazily: losing captures wait for the last stage
+        self.stage = GOOD_CAPTURES
+        stats = searcher.stats
+        start = time.perf_counter()
+        captures = board.generate_captures()
+        stats.movegen_time += time.perf_counter() - start
+        captures.sort(key=lambda m: searcher.mvv_lva(board, m), reverse=True)
+        bad_captures = []
+        for move in captures:
+            if move == tt_move:
+                continue
+            if board.is_capture(move) and not searcher.see(board, move):
+                bad_captures.append(move)
+                continue
+            yield move
+
+        # 3. Killers -> Quiet moves that cut off at this ply in sibling nodes
+        self.stage = KILLERS
+        killers = searcher.killers[self.ply].tolist()
+        for move in killers:
+            if move and move != tt_move and board.is_pseudo_legal(move) and not board.is_capture(move) and not move >> 12:
+                yield move
+
+        # 4. Countermove -> Quiet reply that last refuted the opponent's previous move
+        self.stage = COUNTERMOVE
+        previous = board.stack[-1][0] if board.stack else 0
+        counter = int(searcher.countermoves[previous & 0xFFF]) if previous else 0
+        if counter and counter != tt_move and counter not in killers and board.is_pseudo_legal(counter) and not board.is_capture(counter) and not counter >> 12:
+            yield counter
+        else:
+            counter = 0
+
+        # 5. Quiets by history -> One vectorized gather from the butterfly table, then a plain sort
+        self.stage = QUIETS
+        start = time.perf_counter()
+        quiets = board.generate_quiets()
+        stats.movegen_time += time.perf_counter() - start
+        if len(quiets) > 1:
+            scores = searcher.history[int(board.turn)].take([m & 0xFFF for m in quiets]).tolist()
+            order = sorted(range(len(quiets)), key=scores.__getitem__, reverse=True)
+            quiets = [quiets[j] for j in order]
+        for move in quiets:
+            if move != tt_move and move != counter and move not in killers:
+                yield move
+
+        # 6. Bad Captures -> Still searched (they may be tactically sound), just last
+        self.stage = BAD_CAPTURES
+        yield from bad_captures
@@ -0,0 +1,220 @@
+import sys
+import time
+import argparse
+import multiprocessing as mp
+import numpy as np
+import chess
+from engines.bot.bitboard import SearchBoard, encode_move, decode_move
+from engines.bot.tt import table_entries
+
+# Constants & Configuration
+PERFT_HASH_MB = 16 # Size of the perft transposition table (0 = plain perft)
+SUITE_MAX_NODES = 1_000_000 # The suite searches each position to its deepest depth with at most this many leaf nodes
+DEPTH_SALT = 0x9E3779B97F4A7C15 # Mixed into the key per depth, so one position at two depths uses two slots
+MASK64 = (1 << 64) - 1
+
+# Perft Suite -> (name, FEN, leaf counts at depth 1, 2, ...). Counts checked against python-chess (`reference_perft`)
+PERFT_SUITE = [
+    ("startpos", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", [20, 400, 8902, 197281, 4865609]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862, 4085603]),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624]),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467, 422333]),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379, 2103487]),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", [46, 2079, 89890, 3894594]),
+    # En passant
+    ("illegal-ep", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", [18, 92, 1670, 10138, 185429, 1134888]),
+    ("ep-capture-checks", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", [15, 126, 1928, 13931, 206379, 1440467]),
+    # Castling
+    ("short-castle-check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", [15, 66, 1198, 6399, 120330, 661072]),
+    ("long-castle-check", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", [16, 71, 1286, 7418, 141077, 803711]),
+    ("castle-rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", [26, 1141, 27826, 1274206]),
+    ("castle-prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", [44, 1494, 50509, 1720476]),
+    # Promotion
+    ("promote-out-of-check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", [11, 133, 1442, 19174, 266199, 3821001]),
+    ("promote-to-check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", [9, 40, 472, 2661, 38983, 217342]),
+    ("underpromote-to-check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", [6, 27, 273, 1329, 18135, 92683]),
+    # Checks, mates and stalemates
+    ("discovered-check", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1", [29, 165, 5160, 31961, 1004658]),
+    ("double-check", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1", [37, 183, 6559, 23527]),
+    ("self-stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", [2, 6, 13, 63, 382, 2217]),
+    ("stalemate-checkmate", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", [10, 25, 268, 926, 10857, 43261, 567584]),
+]
+
+class PerftTable:
+    """
+    Fixed-size, always-replace table of (position, depth) -> leaf count, the transposition table of hashed perft.
+    Keyed by the board's Zobrist key: positions with equal keys have the same legal moves (the key only includes the
+    en passant square when a capture is possible), so their subtree counts are interchangeable.
+    """
+    def __init__(self, size_mb=PERFT_HASH_MB):
+        self.size = table_entries(size_mb)
+        self.mask = self.size - 1
+        self.keys = np.zeros(self.size, dtype=np.uint64)
+        self.counts = np.zeros(self.size, dtype=np.uint64)
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key, depth):
+        self.probes += 1
+        key = (key ^ (depth * DEPTH_SALT)) & MASK64
+        i = key & self.mask
+        if int(self.keys[i]) != key: return None
+        self.hits += 1
+        return int(self.counts[i])
+
+    def store(self, key, depth, nodes):
+        key = (key ^ (depth * DEPTH_SALT)) & MASK64
+        i = key & self.mask
+        self.keys[i] = key
+        self.counts[i] = nodes
+
+# Perft -> Leaf nodes of the legal move tree, through the search's own movegen and make/unmake (pseudo-legal + was_legal)
+def _perft(board, depth):
+    nodes = 0
+    for move in board.generate_moves():
+        board.push(move)
+        if board.was_legal():
+            nodes += 1 if depth == 1 else _perft(board, depth - 1) # Bulk count at depth 1: legal replies are the leaves
+        board.pop()
+    return nodes
+
+def _hashed_perft(board, depth, table):
+    if depth == 1:
+        return len(board.legal_moves()) # Cheaper than a probe
+    nodes = table.probe(board.key, depth)
+    if nodes is not None:
+        return nodes
+    nodes = 0
+    for move in board.generate_moves():
+        board.push(move)
+        if board.was_legal():
+            nodes += _hashed_perft(board, depth - 1, table)
+        board.pop()
+    table.store(board.key, depth, nodes)
+    return nodes
+
+def perft(board, depth, table=None):
+    """Leaf count of `board` (a SearchBoard) at `depth`, hashed when given a PerftTable."""
+    if depth <= 0:
+        return 1
+    return _hashed_perft(board, depth, table) if table is not None else _perft(board, depth)
+
+def divide(board, depth, table=None):
+    """Leaf count under each legal root move as [(uci, nodes)], for finding the move where two generators disagree."""
+    result = []
+    for move in board.legal_moves():
+        board.push(move)
+        result.append((decode_move(move).uci(), perft(board, depth - 1, table)))
+        board.pop()
+    return result
+
+# Root Split -> Each worker process counts whole root subtrees, with its own table
+def _divide_worker(args):
+    fen, uci, depth, hash_mb = args
+    board = SearchBoard.from_board(chess.Board(fen))
+    board.push(encode_move(chess.Move.from_uci(uci)))
+    return uci, perft(board, depth - 1, PerftTable(hash_mb) if hash_mb else None)
+
+def parallel_divide(fen, depth, processes, hash_mb=PERFT_HASH_MB):
+    """`divide` with the root moves spread over `processes` worker processes (spawned, like the Lazy SMP helpers)."""
+    board = SearchBoard.from_board(chess.Board(fen))
+    jobs = [(fen, decode_move(move).uci(), depth, hash_mb) for move in board.legal_moves()]
+    with mp.get_context("spawn").Pool(processes) as pool:
+        return pool.map(_divide_worker, jobs, chunksize=1)
+
+def run_perft(fen, depth, hash_mb=PERFT_HASH_MB, processes=1):
+    """Returns {"fen", "depth", "nodes", "time", "nps", "divide"} for one position, split at the root when processes > 1."""
+    start = time.perf_counter()
+    if processes > 1 and depth > 1:
+        moves = parallel_divide(fen, depth, processes, hash_mb)
+    else:
+        moves = divide(SearchBoard.from_board(chess.Board(fen)), depth, PerftTable(hash_mb) if hash_mb else None)
+    elapsed = time.perf_counter() - start
+    nodes = sum(n for _, n in moves)
+    return {"fen": fen, "depth": depth, "nodes": nodes, "time": elapsed, "nps": int(nodes / elapsed) if elapsed > 0 else 0, "divide": moves}
+
+# Reference -> The same counts from python-chess, the ground truth for the search's move generator
+def reference_perft(board, depth):
+    if depth <= 0:
+        return 1
+    if depth == 1:
+        return board.legal_moves.count()
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += reference_perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+def reference_divide(fen, depth):
+    board = chess.Board(fen)
+    result = []
+    for move in board.legal_moves:
+        board.push(move)
+        result.append((move.uci(), reference_perft(board, depth - 1)))
+        board.pop()
+    return result
+
+def verify_divide(moves, reference):
+    """Root moves whose counts differ (or that only one side generates) as [(uci, ours, reference)], None = missing."""
+    ours, theirs = dict(moves), dict(reference)
+    return [(uci, ours.get(uci), theirs.get(uci)) for uci in sorted(set(ours) | set(theirs)) if ours.get(uci) != theirs.get(uci)]
+
+def suite_depth(counts, max_nodes):
+    return max([d for d, n in enumerate(counts, 1) if n <= max_nodes], default=1)
+
+def run_suite(max_nodes=SUITE_MAX_NODES, hash_mb=PERFT_HASH_MB, processes=1, progress=None):
+    """Runs every PERFT_SUITE position at its deepest depth within `max_nodes`; rows carry "expected" and "ok"."""
+    rows = []
+    for name, fen, counts in PERFT_SUITE:
+        depth = suite_depth(counts, max_nodes)
+        row = run_perft(fen, depth, hash_mb, processes)
+        row.update(name=name, expected=counts[depth - 1], ok=row["nodes"] == counts[depth - 1])
+        rows.append(row)
+        if progress:
+            progress(row)
+    return rows
+
+def format_suite(rows):
+    lines = [f"{'position':<24} {'depth':>5} {'nodes':>10} {'expected':>10} {'time':>8} {'nps':>9}  result"]
+    for r in rows:
+        lines.append(f"{r['name']:<24} {r['depth']:>5} {r['nodes']:>10} {r['expected']:>10} {r['time']:>7.2f}s {r['nps']:>9}  {'OK' if r['ok'] else 'FAIL'}")
+    nodes = sum(r["nodes"] for r in rows)
+    elapsed = sum(r["time"] for r in rows)
+    lines += ["", f"Positions: {len(rows)}  Failed: {sum(not r['ok'] for r in rows)}  Nodes: {nodes}  Time: {elapsed:.2f}s  NPS: {int(nodes / elapsed) if elapsed > 0 else 0}"]
+    return "\n".join(lines)
+
+# CLI -> python -m engines.bot.perft [--fen FEN] [--depth N] [--divide] [--verify] | --suite [--max-nodes N]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft for the search's move generator (SearchBoard), checked against python-chess.")
+    parser.add_argument("--fen", default=chess.STARTING_FEN)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--divide", action="store_true", help="Print the leaf count under each root move")
+    parser.add_argument("--verify", action="store_true", help="Compare the divide with python-chess (exit 1 on a difference)")
+    parser.add_argument("--suite", action="store_true", help="Run the standard perft positions against their known counts")
+    parser.add_argument("--max-nodes", type=int, default=SUITE_MAX_NODES, help="Suite: deepest depth with at most this many nodes")
+    parser.add_argument("--hash", type=float, default=PERFT_HASH_MB, help="Perft table size in MB (0 = plain perft, the movegen throughput benchmark)")
+    parser.add_argument("--processes", type=int, default=1, help="Split the root moves over N processes")
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        rows = run_suite(args.max_nodes, args.hash, args.processes, lambda r: print(f"{r['name']}: {r['nodes']} {'OK' if r['ok'] else 'FAIL'}", file=sys.stderr))
+        print(format_suite(rows))
+        return 0 if all(r["ok"] for r in rows) else 1
+
+    result = run_perft(args.fen, args.depth, args.hash, args.processes)
+    if args.divide:
+        for uci, nodes in result["divide"]:
+            print(f"{uci}: {nodes}")
+        print()
+    print(f"Depth: {result['depth']}  Nodes: {result['nodes']}  Time: {result['time']:.3f}s  NPS: {result['nps']}")
+    if args.verify:
+        mismatches = verify_divide(result["divide"], reference_divide(args.fen, args.depth))
+        for uci, ours, theirs in mismatches:
+            print(f"Mismatch {uci}: {ours} (SearchBoard) != {theirs} (python-chess)")
+        print("Verified against python-chess: " + ("FAIL" if mismatches else "OK"))
+        return 1 if mismatches else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
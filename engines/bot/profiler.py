@@ -0,0 +1,177 @@
+import io
+import os
+import sys
+import time
+import signal
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+# Constants & Configuration
+PROFILE_MODES = ("cprofile", "sample") # Deterministic (every call, slower) or statistical (stack samples, ~no overhead)
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), "profiles") # Default output directory (BOT_PROFILE_DIR overrides)
+SAMPLE_INTERVAL = 0.001 # Seconds (of CPU time on the main thread) between stack samples
+THREAD_SAMPLE_INTERVAL = 0.005 # Seconds between samples off the main thread (each one takes the GIL from the search)
+TOP_N = 30 # Rows in the top-N table
+
+# Stage Clocks -> [name]: SearchStats attribute, the search's own perf_counter time for that stage. These are the reported
+# per-stage totals: the same in every mode and on every thread, unlike profile-derived times
+STAGE_CLOCKS = {
+    "get_accumulators": "acc_time",
+    "evaluate": "eval_time",
+    "see": "see_time",
+    "movegen": "movegen_time",
+    "tt_probe": "tt_time",
+}
+
+# Stages -> [name]: (file, functions) whose inclusive profile time is the per-stage total when no stats are given
+STAGES = {
+    "get_accumulators": ("search.py", ("get_accumulators",)),
+    "evaluate": ("search.py", ("evaluate",)),
+    "see": ("bitboard.py", ("see_ge",)),
+    "movegen": ("bitboard.py", ("generate_moves", "generate_captures", "generate_quiets")),
+    "tt_probe": ("tt.py", ("probe",)),
+}
+
+# Profile Mode -> Explicit argument, else the BOT_PROFILE environment variable (unset/empty = off)
+def profile_mode(profile=None):
+    mode = profile if profile is not None else os.getenv("BOT_PROFILE") or None
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}. Expected one of {PROFILE_MODES}.")
+    return mode
+
+def frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+class SearchProfiler:
+    """
+    Profiles one search on the calling thread and writes two files next to each other:
+    - `<stem>.collapsed`: collapsed stacks ("a;b;c weight" per line), the input of flamegraph.pl / speedscope
+    - `<stem>.txt`: the position (FEN, depth, nodes), per-stage wall-time totals (the search's clocks, see STAGE_CLOCKS)
+      and a sorted top-N function table
+    cProfile only records caller -> callee edges, so its collapsed stacks are two frames deep (weight = microseconds);
+    sampled stacks are complete (weight = samples).
+    Sampling on the main thread uses a SIGPROF interval timer: the handler sees the exact interrupted frame.
+    Elsewhere (signals are main-thread only) a helper thread reads the search thread's stack, but it can only run when
+    the search releases the GIL, which NumPy calls do: those samples lean towards NumPy-heavy functions, so only the
+    stage totals (clocks, not samples) are reliable there, and the sampler ticks less often to slow the search down less.
+    """
+    def __init__(self, mode, directory=None, top=TOP_N):
+        self.mode = mode
+        self.directory = directory or os.getenv("BOT_PROFILE_DIR") or PROFILE_DIR
+        self.top = top
+        self.profile = None
+        self.sampler = None
+        self.samples = Counter()
+        self.done = threading.Event()
+        self.use_signal = False
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        if self.mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.use_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+            if self.use_signal:
+                self.previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+                signal.setitimer(signal.ITIMER_PROF, SAMPLE_INTERVAL, SAMPLE_INTERVAL)
+            else:
+                self.thread_id = threading.get_ident()
+                self.done.clear()
+                self.sampler = threading.Thread(target=self._sample, daemon=True)
+                self.sampler.start()
+
+    def record(self, frame):
+        stack = []
+        while frame is not None:
+            stack.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+
+    # SIGPROF Handler -> Runs on the main thread between bytecodes, `frame` is the interrupted one
+    def _on_signal(self, signum, frame):
+        self.record(frame)
+
+    # Sampler Thread -> Snapshot the search thread's stack
+    def _sample(self):
+        while not self.done.wait(THREAD_SAMPLE_INTERVAL):
+            self.record(sys._current_frames().get(self.thread_id))
+
+    def stop(self, fen, depth, nodes, stats=None):
+        """Ends the profile and writes the report. Returns {"collapsed", "table", "stages"} (paths and stage seconds)."""
+        elapsed = time.perf_counter() - self.start_time
+        if self.mode == "cprofile":
+            self.profile.disable()
+            collapsed, table, stages = self._cprofile_report()
+        else:
+            if self.use_signal:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+                signal.signal(signal.SIGPROF, self.previous_handler)
+            else:
+                self.done.set()
+                self.sampler.join()
+            collapsed, table, stages = self._sample_report(elapsed)
+        clocks = stats is not None
+        if clocks:
+            stages = {name: getattr(stats, attr) for name, attr in STAGE_CLOCKS.items()}
+
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}_{self.mode}_d{depth}_n{nodes}")
+        with open(stem + ".collapsed", "w") as f:
+            f.writelines(f"{stack} {weight}\n" for stack, weight in collapsed.items() if weight > 0)
+
+        header = [
+            f"FEN: {fen}",
+            f"Mode: {self.mode}{' (thread sampler: function table biased towards NumPy calls)' if self.mode == 'sample' and not self.use_signal else ''}  Depth: {depth}  Nodes: {nodes}  Wall time: {elapsed:.3f}s",
+            "",
+            f"Stage totals ({'search clocks' if clocks else 'inclusive profile time'}, s):",
+        ]
+        header += [f"  {name:<18}{seconds:10.4f}" for name, seconds in stages.items()]
+        if stats is not None:
+            header += ["", f"Search stats: {stats}"]
+        with open(stem + ".txt", "w") as f:
+            f.write("\n".join(header) + "\n\n" + table)
+        return {"collapsed": stem + ".collapsed", "table": stem + ".txt", "stages": stages}
+
+    # cProfile -> Edge stacks "caller;callee" weighted by the callee's own time under that caller
+    def _cprofile_report(self):
+        stats = pstats.Stats(self.profile)
+        collapsed = Counter()
+        stages = dict.fromkeys(STAGES, 0.0)
+        for (filename, line, name), (cc, nc, tt, ct, callers) in stats.stats.items():
+            label = f"{os.path.basename(filename)}:{name}"
+            for (c_file, c_line, c_name), edge in callers.items():
+                collapsed[f"{os.path.basename(c_file)}:{c_name};{label}"] += int(edge[2] * 1e6)
+            if not callers:
+                collapsed[label] += int(tt * 1e6)
+            for stage, (stage_file, functions) in STAGES.items():
+                if name in functions and os.path.basename(filename) == stage_file:
+                    stages[stage] += ct
+
+        buffer = io.StringIO()
+        pstats.Stats(self.profile, stream=buffer).sort_stats("tottime").print_stats(self.top)
+        return collapsed, buffer.getvalue(), stages
+
+    # Sampling -> Self samples (leaf frame) and inclusive samples (anywhere on the stack) per function
+    def _sample_report(self, elapsed):
+        total = sum(self.samples.values())
+        per_sample = elapsed / total if total else 0.0
+        own, inclusive = Counter(), Counter()
+        stages = dict.fromkeys(STAGES, 0.0)
+        for stack, count in self.samples.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            seen = set(frames)
+            for label in seen:
+                inclusive[label] += count
+            for stage, (stage_file, functions) in STAGES.items():
+                if any(f"{stage_file}:{name}" in seen for name in functions):
+                    stages[stage] += count * per_sample
+
+        lines = [f"{total} samples, {per_sample * 1000:.2f} ms/sample", "", f"{'self':>8} {'self%':>7} {'total':>8} {'total%':>7}  function"]
+        for label, count in own.most_common(self.top):
+            lines.append(f"{count:8d} {100.0 * count / total:6.1f}% {inclusive[label]:8d} {100.0 * inclusive[label] / total:6.1f}%  {label}")
+        return self.samples, "\n".join(lines) + "\n", stages
@@ -1,16 +1,76 @@
 import os
+import math
 import time
+import atexit
+import threading
 import torch
 import numpy as np
 import chess
 import chess.polyglot
+import chess.engine
 from engines.bot.model import NNUE
-from engines.bot.dataset import get_halfkp_features, get_feature_deltas
+from engines.bot.accumulator import AccumulatorStack
+from engines.bot.inference import NumpyNNUE
+from engines.bot.evalcache import EvalCache
+from engines.bot.timeman import TimeManager
+from engines.bot.movepick import MovePicker
+from engines.bot.stats import SearchStats
+from engines.bot.profiler import SearchProfiler, profile_mode
+from engines.bot.smp import SharedTranspositionTable, HelperPool, can_start_helpers
+from engines.bot.bitboard import SearchBoard, decode_move, NO_MOVE, PAWN, KNIGHT, BISHOP, ROOK, QUEEN
+from engines.bot.tt import TranspositionTable, bits_to_score, DEPTH_SHIFT, FLAG_SHIFT, SCORE_SHIFT
 
 # Constants & Configuration
 INF = 99999 # INF scores for special cases (e.g. checkmate)
 MATE_SCORE = 99000 # Mate score for "Mate" case
-TT_SIZE = 1_000_000 # Used for caching
+TT_MB = 16 # Transposition table size in MB (~1M entries)
+EVAL_CACHE_MB = 4 # Static evaluation cache size in MB (~256K entries)
+MAX_PLY = 128 # Deepest ply (main + quiescence search) with an accumulator slot
+MAX_DEPTH = 64 # Iterative deepening cap when only the clock limits the search
+CHECK_INTERVAL = 1024 # Nodes (main + quiescence) between clock checks, power of two
+SEE_PRUNE_DEPTH = 6 # SEE pruning in pvs only this close to the horizon
+SEE_QUIET_MARGIN = 20 # Quiets may lose up to margin * depth^2 (centipawns) before being pruned
+SEE_CAPTURE_MARGIN = 100 # Captures may lose up to margin * depth
+MATE_BOUND = MATE_SCORE - MAX_PLY # Scores beyond this are mate scores
+
+# Pruning Suite -> Each technique can be switched off with Searcher(pruning={"name": False}) and counts how often it fires
+PRUNING = ("mate_distance", "rfp", "razoring", "futility", "lmp", "see", "lmr", "delta")
+EVAL_PAWN = 0.1 # Rough network units per pawn (the network predicts the side to move's result, 0..1)
+RFP_DEPTH = 6 # Reverse futility: static eval beats beta by RFP_MARGIN per ply of depth
+RFP_MARGIN = 0.8 * EVAL_PAWN
+RAZOR_DEPTH = 2 # Razoring: static eval far below alpha -> verify with quiescence
+RAZOR_MARGIN = 3.0 * EVAL_PAWN
+FUTILITY_DEPTH = 3 # Futility: quiet moves can't lift static eval + margin above alpha
+FUTILITY_BASE = 1.0 * EVAL_PAWN
+FUTILITY_MARGIN = 1.0 * EVAL_PAWN
+LMP_DEPTH = 4 # Late move pruning: skip quiets after LMP_BASE + depth^2 moves
+LMP_BASE = 3
+LMR_MIN_MOVES = 3 # Late move reductions from this legal move index, amount from reduction_table
+DELTA_MARGIN = 2.0 * EVAL_PAWN # Quiescence delta pruning: stand pat + captured piece + margin still below alpha
+BACKENDS = ("numpy", "torch") # NNUE inference backends for evaluate
+
+# Draw Point -> The network predicts the side to move's result (0..1). Negamax needs zero-sum scores, so search scores are
+# network output - DRAW_SCORE: positive = better for the side to move, 0 = even, consistent with draws returning 0
+DRAW_SCORE = 0.5
+
+# Reported Centipawns -> The network output is a win probability p. Engine info converts it with the inverse of the usual
+# logistic (p = 1 / (1 + 10^(-cp / 400))), so lichess-bot's draw/resign thresholds see an ordinary centipawn scale
+INFO_CP_MAX = 2000 # Clamp: mop-up can push a won score past p = 1
+
+# Windows (network units) -> Zero-window searches and root aspiration windows around the previous iteration's score
+NULL_WINDOW = 0.01 * EVAL_PAWN # Zero-window width, about a centipawn
+ASPIRATION_DEPTH = 4 # Iterations from this depth start with an aspiration window
+ASPIRATION_WINDOW = 0.25 * EVAL_PAWN # Initial half-width
+ASPIRATION_GROWTH = 2 # Half-width multiplier after each fail low/high
+ASPIRATION_MAX = 1.0 # Half-width past which the re-search uses the full window
+
+# Quiet Move Heuristics -> Butterfly tables indexed by a move's low 12 bits (from | to << 6)
+HISTORY_MAX = 16384 # Gravity bound: history scores stay within [-HISTORY_MAX, HISTORY_MAX]
+HISTORY_BONUS_MAX = 1536 # Per-cutoff bonus = min(depth^2 * 16, this)
+HISTORY_AGING = 1 # Right shift applied to every history score between moves (halves them)
+
+# Captured piece values in network units (delta pruning)
+EVAL_PIECE_VALUES = [0, EVAL_PAWN, 3.2 * EVAL_PAWN, 3.3 * EVAL_PAWN, 5 * EVAL_PAWN, 9 * EVAL_PAWN, 0]
 
 # Most Valuable Victim - Least Valuable Attacker (MVV-LVA) Values
 PIECE_VALUES = {
@@ -22,30 +82,103 @@ PIECE_VALUES = {
     chess.KING: 20000
 }
 
+# TT Mate Scores -> The search scores mates by distance from the root (MATE_SCORE - ply), the TT stores them by
+# distance from the node, so an entry probed at another ply (transposition, later search) still gives the right mate
+def score_to_tt(score, ply):
+    if score >= MATE_BOUND: return score + ply
+    if score <= -MATE_BOUND: return score - ply
+    return score
+
+def score_from_tt(score, ply):
+    if score >= MATE_BOUND: return score - ply
+    if score <= -MATE_BOUND: return score + ply
+    return score
+
+# Centipawns of a (non-mate) search score, from the side to move's point of view
+def score_to_cp(score):
+    p = score + DRAW_SCORE
+    if p >= 1: return INFO_CP_MAX
+    if p <= 0: return -INFO_CP_MAX
+    return max(-INFO_CP_MAX, min(INFO_CP_MAX, round(400 * math.log10(p / (1 - p)))))
+
 class Searcher:
-    def __init__(self, model_path=None):
-        self.device = torch.device("cpu") # Force CPU for sequential search (faster than GPU)
+    def __init__(self, model_path=None, tt_mb=TT_MB, eval_cache_mb=EVAL_CACHE_MB, debug_hash=None, backend="numpy", batch_qsearch=False, threads=1, pruning=None):
+        self.device = torch.device("cpu") # Force CPU for sequential search (faster than GPU), parallelism comes from Lazy SMP processes
         self.model = NNUE().to(self.device)
         self.model_loaded = False
         
+        # Inference Backend -> "numpy" (fused, no torch dispatch per leaf) or "torch" (NNUE.forward_network)
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown NNUE backend: {backend}. Expected one of {BACKENDS}.")
+        self.backend = backend
+        self.nnue = NumpyNNUE(self.model)
+        
         if model_path is None:
             model_path = os.path.join(os.path.dirname(__file__), "model", "mlp_model.pth")
             
+        self.model_path = model_path
         self.load_model(model_path)
         
         # Search State
-        self.tt = {} # Transposition Table: key -> (depth, score, flag, move)
-        self.history = {} # [color][from][to] -> score
-        self.killers = {} # [depth] -> [move1, move2]
+        self.tt = TranspositionTable(tt_mb) # Transposition Table: fixed-size, key -> (depth, score, flag, move)
+        self.eval_cache = EvalCache(eval_cache_mb) # Eval Cache: fixed-size, key -> static evaluation
+        self.history = np.zeros((2, 4096), dtype=np.int32) # [color][from | to << 6] -> score (gravity-bounded)
+        self.killers = np.zeros((MAX_PLY, 2), dtype=np.uint16) # [ply] -> [move1, move2]
+        self.countermoves = np.zeros(4096, dtype=np.uint16) # [previous move's from | to << 6] -> quiet reply that cut off
+        
+        # Accumulator Stack -> Preallocated [ply][perspective] slots, updated lazily and in place
+        self.accumulators = AccumulatorStack(self.model, MAX_PLY)
+        self.net_scores = [None] * MAX_PLY # [ply] -> network score already computed by a batched parent
+        self.batch_qsearch = batch_qsearch # Evaluate quiescence capture children in one batched network call
+        
+        # Pruning Suite -> Toggles and per-search counters of how often each technique fired
+        self.pruning = dict.fromkeys(PRUNING, True)
+        if pruning:
+            unknown = set(pruning) - set(PRUNING)
+            if unknown:
+                raise ValueError(f"Unknown pruning techniques: {sorted(unknown)}. Expected some of {PRUNING}.")
+            self.pruning.update(pruning)
+        self.prune_counts = dict.fromkeys(PRUNING, 0)
+        
+        # Incremental Zobrist Key -> Kept by the SearchBoard on make/unmake instead of rehashing at every node
+        if debug_hash is None:
+            debug_hash = os.getenv("BOT_DEBUG_HASH") == "1"
+        self.debug_hash = debug_hash # Verify every incremental key against chess.polyglot (slow)
         
         self.nodes = 0 # Nodes searched
-        self.start_time = 0 # Start time of search
-        self.time_limit = 5.0 # Time limit for search
+        self.qnodes = 0 # Quiescence nodes searched
+        self.timer = TimeManager() # Soft/hard deadlines for the current search
+        self.stats = SearchStats() # Per-search counters (see collect_stats / info)
+        self.last_profile = None # Report of the last profiled search: {"collapsed", "table", "stages"}
         self.stopped = False # Whether search has been stopped
+        self.stop_event = None # Lazy SMP helpers -> Set by the main process to stop this search
+        self.verbose = True # Print the per-iteration info line
+        
+        # Lazy SMP -> threads - 1 helper processes sharing the TT (started by set_threads)
+        self.threads = 1
+        self.helpers = None
+        self.close_registered = False # atexit hook, registered once by the first set_threads(> 1)
+        
+        # Pondering -> Background search of the position after the expected reply
+        self.ponder_thread = None
+        self.ponder_key = None # Zobrist key of the pondered position (detects a ponder hit)
+        self.ponder_result = None
         
         # Precomputed Tables
         self.reduction_table = [[0] * 64 for _ in range(64)]
+        
+        # Principal Variation -> Triangular table: row [ply] holds the best line from that ply, pv_length[ply] moves long
+        self.pv_table = [[NO_MOVE] * (MAX_PLY - ply) for ply in range(MAX_PLY)]
+        self.pv_length = [0] * MAX_PLY
+        self.pv = [] # Principal variation of the last search (chess.Move list)
+        
+        # Root -> [move, nodes spent below it in the current iteration], re-sorted between iterations
+        self.root_moves = []
+        self.root_best = NO_MOVE
+        self.lines = [] # MultiPV -> Top root moves of the last completed iteration, best first
         self._init_lmr_table()
+        
+        self.set_threads(threads)
 
     # Late Move Reduction (LMR) Table
     def _init_lmr_table(self):
@@ -60,6 +193,7 @@ class Searcher:
             try:
                 self.model.load_state_dict(torch.load(path, map_location=self.device))
                 self.model.eval()
+                self.nnue = NumpyNNUE(self.model) # Re-snapshot the inference weights
                 self.model_loaded = True
                 print(f"Loaded model from {path}")
             except Exception as e:
@@ -68,301 +202,439 @@ class Searcher:
             print(f"Model not found at {path}")
 
     # NNUE Wrappers
-    def get_accumulators(self, board, move, acc_w, acc_b):
-        """Calculates new accumulators efficiently."""
-        deltas = get_feature_deltas(board, move)
-        
-        # Full Recompute -> If the move is not a capture, we need to recompute the accumulators from scratch
-        if deltas is None:
-            board.push(move)
-            f_w = get_halfkp_features(board, perspective=chess.WHITE)
-            f_b = get_halfkp_features(board, perspective=chess.BLACK)
-            board.pop()
+    def set_root_accumulators(self, board):
+        self.accumulators.set_root(board)
+        self.net_scores[0] = None
+
+    # Deferred Update -> Called before `move` is made at `ply`, only records the child's pending delta
+    def defer_accumulators(self, board, move, ply):
+        self.accumulators.push(board, move, ply)
+        self.net_scores[ply + 1] = None
+
+    def get_accumulators(self, board, ply):
+        """Returns the [2, hidden_dim] accumulators (BLACK=0, WHITE=1) of the node at `ply`, materializing them on first use."""
+        return self.accumulators.get(board, ply)
+
+    # Network Score -> NNUE output for the side to move at `ply`, centered on the draw point
+    def network_score(self, board, ply):
+        score = self.net_scores[ply]
+        if score is not None:
+            return score # Already computed in a batch by the parent
+
+        self.get_accumulators(board, ply)
+        turn = board.turn
+        start = time.perf_counter()
+        if self.backend == "numpy":
+            views = self.accumulators.views[ply]
+            score = self.nnue.forward(views[turn], views[not turn]) - DRAW_SCORE
+        else:
+            views = self.accumulators.tensor_views[ply]
             with torch.no_grad():
-                new_w = self.model.get_accumulator(torch.tensor(f_w, dtype=torch.long, device=self.device))
-                new_b = self.model.get_accumulator(torch.tensor(f_b, dtype=torch.long, device=self.device))
-            return new_w, new_b
-
-        # Incremental Update -> If the move is a capture, we can update the accumulators incrementally
-        added_w, removed_w, added_b, removed_b = deltas
-        with torch.no_grad():
-            t_add_w = torch.tensor(added_w, dtype=torch.long, device=self.device)
-            t_rem_w = torch.tensor(removed_w, dtype=torch.long, device=self.device)
-            new_w = self.model.update_accumulator(acc_w.clone(), t_add_w, t_rem_w)
-
-            t_add_b = torch.tensor(added_b, dtype=torch.long, device=self.device)
-            t_rem_b = torch.tensor(removed_b, dtype=torch.long, device=self.device)
-            new_b = self.model.update_accumulator(acc_b.clone(), t_add_b, t_rem_b)
-        return new_w, new_b
-
-    # Evaluation -> Evaluate the board position using the NNUE model
-    def evaluate(self, board, acc_w, acc_b):
+                score = self.model.forward_network(views[turn], views[not turn]).item() - DRAW_SCORE
+        self.stats.eval_time += time.perf_counter() - start
+        return score
+
+    # Batched Network Scores -> One forward pass over n child accumulators ([n, 2, hidden_dim], child to move)
+    def network_scores(self, accs, child_turn):
+        us = accs[:, int(child_turn)]
+        them = accs[:, int(not child_turn)]
+        start = time.perf_counter()
+        if self.backend == "numpy":
+            scores = (self.nnue.forward_batch(us, them) - DRAW_SCORE).tolist()
+        else:
+            with torch.no_grad():
+                scores = (self.model.forward_network(torch.from_numpy(us), torch.from_numpy(them))[:, 0] - DRAW_SCORE).tolist()
+        self.stats.eval_time += time.perf_counter() - start
+        return scores
+
+    # Evaluation -> Evaluate the board position using the NNUE model (cached by Zobrist key)
+    def evaluate(self, board, ply):
         """NNUE Evaluation + Mop-up"""
+        key = board.key
+        score = self.eval_cache.probe(key)
+        if score is None:
+            score = self.static_eval(board, ply)
+            self.eval_cache.store(key, score)
+        return score
+
+    def static_eval(self, board, ply):
+        score = self.network_score(board, ply)
         turn = board.turn
-        active_acc = acc_w if turn == chess.WHITE else acc_b
-        inactive_acc = acc_b if turn == chess.WHITE else acc_w
-        
-        with torch.no_grad():
-            score = self.model.forward_network(active_acc, inactive_acc).item()
             
         # Mop-up Term logic
-        if score < 0.5: return score
+        if score < 0: return score
 
-        winning_factor = (score - 0.5) * 2
+        winning_factor = score * 2
         
         us = turn
         them = not us
-        k_us = board.king(us)
-        k_them = board.king(them)
-        
-        if k_us is None or k_them is None: return score
+        k_us = board.king_sq[us]
+        k_them = board.king_sq[them]
         
         # Center Manhattan Distance
-        f_them, r_them = chess.square_file(k_them), chess.square_rank(k_them)
+        f_them, r_them = k_them & 7, k_them >> 3
         cmd = abs(f_them - 3.5) + abs(r_them - 3.5)
         
         # Distance between kings
-        f_us, r_us = chess.square_file(k_us), chess.square_rank(k_us)
+        f_us, r_us = k_us & 7, k_us >> 3
         dist = abs(f_us - f_them) + abs(r_us - r_them)
         
         mopup = 4.7 * cmd + 1.6 * (14 - dist)
         
         # Pawn push bonus
         pawn_bonus = 0
-        for sq in board.pieces(chess.PAWN, us):
-            r = chess.square_rank(sq) if us == chess.WHITE else 7 - chess.square_rank(sq)
-            pawn_bonus += r * 0.01
+        pawns = board.pieces[PAWN] & board.occ[us]
+        while pawns:
+            b = pawns & -pawns
+            pawns ^= b
+            r = (b.bit_length() - 1) >> 3
+            pawn_bonus += (r if us == chess.WHITE else 7 - r) * 0.01
 
         final_score = score + (mopup * 0.05 + pawn_bonus) * winning_factor
         return final_score
 
     # Helpers
 
-    # Time Management
+    # Make/Unmake -> The SearchBoard keeps the running Zobrist key in sync (NO_MOVE = null move)
+    def make_move(self, board, move, ply):
+        self.defer_accumulators(board, move, ply)
+        if move == NO_MOVE:
+            board.push_null()
+        else:
+            board.push(move)
+        if self.debug_hash:
+            expected = chess.polyglot.zobrist_hash(board.to_board())
+            if board.key != expected:
+                raise RuntimeError(f"Zobrist mismatch after {decode_move(move)} in {board.fen()}: {board.key:016x} != {expected:016x}")
+
+    def unmake_move(self, board):
+        if board.stack[-1][0] == NO_MOVE:
+            board.pop_null()
+        else:
+            board.pop()
+
+    # Time Management -> Hard deadline, polled every CHECK_INTERVAL nodes from both searches
     def check_time(self):
-        if self.nodes % 2048 == 0:
-            if time.time() - self.start_time > self.time_limit:
+        if (self.nodes + self.qnodes) & (CHECK_INTERVAL - 1) == 0:
+            if self.timer.hard_expired(self.nodes + self.qnodes):
+                self.stopped = True
+            elif self.stop_event is not None and self.stop_event.is_set():
                 self.stopped = True
 
     # Most Valuable Victim - Least Valuable Aggressor (MVV-LVA)
     def mvv_lva(self, board, move):
-        victim = board.piece_at(move.to_square)
+        victim = board.squares[(move >> 6) & 63]
         if not victim: return 0
-        aggressor = board.piece_at(move.from_square)
-        v_val = PIECE_VALUES.get(victim.piece_type, 0)
-        a_val = PIECE_VALUES.get(aggressor.piece_type, 0) if aggressor else 0
+        aggressor = board.squares[move & 63]
+        v_val = PIECE_VALUES.get(victim & 7, 0)
+        a_val = PIECE_VALUES.get(aggressor & 7, 0) if aggressor else 0
         return v_val * 10 - a_val
 
-    # Move Scoring -> Score moves based on transposition table, killers, history, and MVV-LVA
-    def score_move(self, board, move, tt_move, ply):
-        # assumption: the move which was best at depth 1 is still the best move at depth 5 (give priority)
-        if move == tt_move:
-            return 2_000_000
-        
-        # assumption: taking pieces is usually good
-        if board.is_capture(move):
-            return 1_000_000 + self.mvv_lva(board, move)
-            
-        # Killers
-        if ply in self.killers and move in self.killers[ply]:
-            return 900_000
-            
-        # History
-        key = (board.turn, move.from_square, move.to_square)
-        return self.history.get(key, 0)
-
-    # Recursive helper for SEE -> battle on the square
-    def see_exchange(self, board, square):
-        value = 0
-        
-        # Find the least valuable attacker for the side to move
-        attackers = board.attackers(board.turn, square)
-        attacker = None
-        attacker_val = INF
-        from_sq = None
-
-        for sq in attackers:
-            piece = board.piece_at(sq)
-            val = PIECE_VALUES[piece.piece_type]
-            if val < attacker_val:
-                attacker_val = val
-                attacker = piece
-                from_sq = sq
-        
-        if attacker is None:
-            return 0 # No one can recapture
-
-        # Simulate the recapture
-        # Expensive for python chess (slow calculation)
-        move = chess.Move(from_sq, square)
-        
-        # Promotion check (simplified)
-        if attacker.piece_type == chess.PAWN and chess.square_rank(square) in [0, 7]:
-            attacker_val = PIECE_VALUES[chess.QUEEN] - PIECE_VALUES[chess.PAWN] # Gain promotion value
-            move.promotion = chess.QUEEN
-
-        board.push(move)
-        value = max(0, attacker_val - self.see_exchange(board, square))
-        board.pop()
-        
-        return value
-
     # Static Exchange Evaluation (SEE) -> Returns True if the capture wins/equals material (avoid fake wins)
     def see_capture(self, board, move):
-        if board.is_en_passant(move):
-            value = PIECE_VALUES[chess.PAWN]
-        else:
-            piece = board.piece_at(move.to_square)
-            # Safety check, though is_capture() implies a piece is there (unless EP)
-            if piece is None: return False 
-            value = PIECE_VALUES[piece.piece_type]
-        
-        # Perform the initial capture on a copy/fast board
-        
-        # Fast approximate SEE:
-        board.push(move)
-        score = value - self.see_exchange(board, move.to_square)
-        board.pop()
-        
-        return score >= 0
+        return board.see_ge(move, 0)
+
+    # SEE -> board.see_ge as the search uses it, timed into stats.see_time
+    def see(self, board, move, threshold=0):
+        start = time.perf_counter()
+        result = board.see_ge(move, threshold)
+        self.stats.see_time += time.perf_counter() - start
+        return result
 
     # Quiescence Search (Search captures only) -> Search captures only to avoid infinite search
-    def quiescence(self, board, alpha, beta, acc_w, acc_b):
+    def quiescence(self, board, alpha, beta, ply):
+        self.qnodes += 1
         self.check_time()
         if self.stopped: return 0
 
+        if ply > self.stats.seldepth: self.stats.seldepth = ply
         in_check = board.is_check()
+        if ply >= MAX_PLY - 1:
+            return self.evaluate(board, ply)
 
         # 1. Stand Pat: Only allowed if NOT in check
         # (If we are in check, we can't just "stand still", we must move)
         if not in_check:
-            stand_pat = self.evaluate(board, acc_w, acc_b)
+            stand_pat = self.evaluate(board, ply)
             if stand_pat >= beta:
                 return beta
             if stand_pat > alpha:
                 alpha = stand_pat
 
-        # 2. Move Gen: All moves if in check, only captures if safe
+        # 2. Move Gen (pseudo-legal): All moves if in check, only captures/promotions if safe
+        start = time.perf_counter()
         if in_check:
-             moves = list(board.legal_moves)
+             moves = board.generate_moves()
         else:
-             moves = [m for m in board.legal_moves if board.is_capture(m) or m.promotion]
-        
-        if not moves: 
-            # If in check and no moves -> Checkmate (return bad score)
-            # If not in check and no moves -> Quiet position (return alpha)
-            return -MATE_SCORE if in_check else alpha
+             moves = board.generate_captures()
+        self.stats.movegen_time += time.perf_counter() - start
             
         # 3. Sort and loop
         moves.sort(key=lambda m: self.mvv_lva(board, m), reverse=True)
         
-        for move in moves:
+        # Children update from this node's accumulators (already built by stand pat unless in check)
+        if moves:
+            self.get_accumulators(board, ply)
+        
+        # Batched Siblings -> Evaluate all capture children in one pass, reorder and delta-prune with the scores
+        batch = None
+        if self.batch_qsearch and not in_check and len(moves) > 1:
+            moves, batch = self.evaluate_children(board, moves, ply, alpha)
+        
+        delta = self.pruning["delta"] and batch is None and not in_check
+        legal_moves = 0
+        for i, move in enumerate(moves):
             # SEE PRUNING: Only prune if NOT in check (priority to get out of check)
-            # and the move is a losing capture.
-            if not in_check and not self.see_capture(board, move): 
+            # and the move is a losing capture. (Batched children are already filtered.)
+            if batch is None and not in_check and board.is_capture(move) and not self.see(board, move): 
                 continue # Skip this bad capture!
+            
+            # Delta Pruning -> Even winning the captured piece for free can't reach alpha (promotions excepted)
+            if delta and not move >> 12 and stand_pat + EVAL_PIECE_VALUES[board.squares[(move >> 6) & 63] & 7 or PAWN] + DELTA_MARGIN <= alpha:
+                self.prune_counts["delta"] += 1
+                continue
                 
-            nw, nb = self.get_accumulators(board, move, acc_w, acc_b)
-            board.push(move)
-            score = -self.quiescence(board, -beta, -alpha, nw, nb)
-            board.pop()
+            self.make_move(board, move, ply)
+            if not board.was_legal():
+                self.unmake_move(board)
+                continue
+            if batch is not None:
+                rows, scores = batch
+                self.accumulators.load(ply + 1, self.accumulators.siblings[ply][rows[i]])
+                self.net_scores[ply + 1] = scores[i]
+            legal_moves += 1
+            score = -self.quiescence(board, -beta, -alpha, ply + 1)
+            self.unmake_move(board)
             
             if score >= beta:
                 return beta
             if score > alpha:
                 alpha = score
+
+        # If in check and no legal moves -> Checkmate (return bad score)
+        if in_check and legal_moves == 0:
+            return -MATE_SCORE + ply
         return alpha
 
+    # Batched Quiescence Children -> Returns (moves, (rows, scores)) for the children worth searching
+    def evaluate_children(self, board, moves, ply, alpha):
+        # Build every legal, SEE-safe child accumulator into this ply's sibling buffer
+        buffer = self.accumulators.sibling_buffer(ply, len(moves))
+        children = []
+        for move in moves:
+            if board.is_capture(move) and not self.see(board, move):
+                continue
+            self.make_move(board, move, ply)
+            if board.was_legal():
+                np.copyto(buffer[len(children)], self.get_accumulators(board, ply + 1))
+                children.append((move, board.is_check()))
+            self.unmake_move(board)
+        if not children:
+            return [], ([], [])
+
+        scores = self.network_scores(buffer[:len(children)], not board.turn)
+
+        # Order by the child's score (lowest = best for us). Delta pruning: a child not in check can stand pat,
+        # and mop-up only adds to its score, so -score <= alpha means the capture cannot raise alpha.
+        kept_moves, rows, kept_scores = [], [], []
+        for row in sorted(range(len(children)), key=scores.__getitem__):
+            move, gives_check = children[row]
+            if not gives_check and -scores[row] <= alpha:
+                continue
+            kept_moves.append(move)
+            rows.append(row)
+            kept_scores.append(scores[row])
+        return kept_moves, (rows, kept_scores)
+
+    # Quiet Cutoff -> Killer, countermove and history bonus for `move`, history malus for the quiets tried before it
+    def update_quiet_stats(self, board, move, quiets, depth, ply):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        
+        previous = board.stack[-1][0] if board.stack else NO_MOVE
+        if previous:
+            self.countermoves[previous & 0xFFF] = move
+        
+        # Gravity -> h += bonus - h * |bonus| / HISTORY_MAX, scores saturate instead of growing without bound
+        history = self.history[int(board.turn)] # int: a bool index would add an axis
+        bonus = min(16 * depth * depth, HISTORY_BONUS_MAX)
+        i = move & 0xFFF
+        h = int(history[i])
+        history[i] = h + bonus - h * bonus // HISTORY_MAX
+        for quiet in quiets:
+            i = quiet & 0xFFF
+            h = int(history[i])
+            history[i] = h - bonus - h * bonus // HISTORY_MAX
+    
     # Helper to check for non-pawn pieces (Zugzwang protection -> NMP hallucination fix)
     def has_non_pawn_material(self, board, color):
         # Check if there is at least one Knight, Bishop, Rook, or Queen
-        for piece_type in [chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]:
-            if board.pieces(piece_type, color):
-                return True
-        return False
+        pieces = board.pieces
+        return bool((pieces[KNIGHT] | pieces[BISHOP] | pieces[ROOK] | pieces[QUEEN]) & board.occ[color])
 
     # Principal Variation Search (PVS) -> Search the best move first (optimistic alpha-beta pruning -> much faster than traditional alpha-beta pruning)
-    def pvs(self, board, depth, alpha, beta, acc_w, acc_b, ply, can_null=True):
+    def pvs(self, board, depth, alpha, beta, ply, can_null=True):
+        self.nodes += 1
+        self.pv_length[ply] = 0
         self.check_time()
         if self.stopped: return 0
-        
-        self.nodes += 1
 
         # Check for draw by repetition or 50-move rule
-        # We return 0 (Draw score)
-        if board.can_claim_threefold_repetition() or board.can_claim_fifty_moves():
+        # We return 0 (Draw score). Both are cheap: the hash history is only scanned back to the last irreversible move.
+        if board.is_fifty_moves() or board.is_repetition(3):
             return 0
         
+        pruning = self.pruning
+        counts = self.prune_counts
+        
+        # Mate Distance Pruning -> A shorter mate was already found elsewhere, this node can't improve on it
+        if pruning["mate_distance"] and ply > 0:
+            alpha = max(alpha, -MATE_SCORE + ply)
+            beta = min(beta, MATE_SCORE - ply - 1)
+            if alpha >= beta:
+                counts["mate_distance"] += 1
+                return alpha
+        
         # TT Probe -> Probe the transposition table for the best move
-        key = chess.polyglot.zobrist_hash(board)
-        tt_move = None
-        if key in self.tt:
-            t_depth, t_score, t_flag, t_move = self.tt[key]
+        stats = self.stats
+        if ply > stats.seldepth: stats.seldepth = ply
+        key = board.key
+        tt_move = NO_MOVE
+        stats.tt_probes += 1
+        start = time.perf_counter()
+        entry = self.tt.probe(key)
+        stats.tt_time += time.perf_counter() - start
+        if entry:
+            stats.tt_hits += 1
+            t_depth = (entry >> DEPTH_SHIFT) & 0xFF
             if t_depth >= depth:
-                if t_flag == 0: return t_score # 0 = EXACT
-                if t_flag == 1 and t_score <= alpha: return t_score # 1 = ALPHA/UPPER
-                if t_flag == 2 and t_score >= beta: return t_score # 2 = BETA/LOWER
-            tt_move = t_move
+                t_score = score_from_tt(bits_to_score(entry >> SCORE_SHIFT), ply)
+                t_flag = (entry >> FLAG_SHIFT) & 3
+                if t_flag == 0 or (t_flag == 1 and t_score <= alpha) or (t_flag == 2 and t_score >= beta): # EXACT, ALPHA/UPPER, BETA/LOWER
+                    stats.tt_cutoffs += 1
+                    return t_score
+            tt_move = entry & 0xFFFF
 
-        if board.is_game_over():
-            if board.is_checkmate(): return -MATE_SCORE + ply
+        # Dead Position (checkmate and stalemate are detected by the move loop below)
+        if board.is_insufficient_material():
             return 0
 
         # Depth budget over, make dumb and fast decision with quiescence search (aggressive)
-        if depth <= 0:
-            return self.quiescence(board, alpha, beta, acc_w, acc_b)
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self.quiescence(board, alpha, beta, ply)
+
+        in_check = board.is_check()
+        pv_node = beta - alpha > 2 * NULL_WINDOW # Anything wider than a zero window (float tolerance)
+        prune_node = not pv_node and not in_check # Node-level pruning never at PV nodes or in check
+        static_eval = -INF if in_check else self.evaluate(board, ply)
+
+        if prune_node and abs(beta) < MATE_BOUND:
+            # Reverse Futility Pruning -> Static eval beats beta by a depth-scaled margin, assume the node fails high
+            if pruning["rfp"] and depth <= RFP_DEPTH and static_eval - RFP_MARGIN * depth >= beta:
+                counts["rfp"] += 1
+                return static_eval
+            
+            # Razoring -> Static eval far below alpha, let quiescence confirm that nothing tactical saves the node
+            if pruning["razoring"] and depth <= RAZOR_DEPTH and static_eval + RAZOR_MARGIN * depth < alpha:
+                score = self.quiescence(board, alpha - NULL_WINDOW, alpha, ply)
+                if score < alpha:
+                    counts["razoring"] += 1
+                    return score
 
         # Null Move Pruning (NMP) -> Prune branches that are not promising
-        # Conditions: depth >= 3, not in check, not PV node (beta-alpha > 1 usually implies PV, but here simply if not root/check)
-        if can_null and depth >= 3 and not board.is_check() and beta < MATE_SCORE:
+        # Conditions: depth >= 3, not in check, not after another null move, beta not a mate score (a null-move cutoff can't prove a mate)
+        if can_null and depth >= 3 and not in_check and abs(beta) < MATE_BOUND:
             # Check if we have non-pawn material (Zugzwang protection)
             if self.has_non_pawn_material(board, board.turn):
                 # Static eval check
-                static_eval = self.evaluate(board, acc_w, acc_b)
                 if static_eval >= beta:
-                    R = 2 if depth > 6 else 2 # Reduction
-                    board.push(chess.Move.null())
-                    # Pass same accumulators as pieces didn't move
-                    score = -self.pvs(board, depth - 1 - R, -beta, -beta + 1, acc_w, acc_b, ply + 1, can_null=False)
-                    board.pop()
+                    R = 3 if depth > 6 else 2 # Reduction, deeper nodes can afford a shallower verification
+                    self.get_accumulators(board, ply) # A cached eval may not have built them
+                    self.make_move(board, NO_MOVE, ply) # Child reuses these accumulators, pieces didn't move
+                    stats.nmp_tries += 1
+                    score = -self.pvs(board, depth - 1 - R, -beta, -beta + NULL_WINDOW, ply + 1, can_null=False)
+                    self.unmake_move(board)
                     if score >= beta:
+                        stats.nmp_cutoffs += 1
                         return beta
 
-        # Move Ordering -> Order moves to try the best moves first
-        moves = list(board.legal_moves)
-        moves.sort(key=lambda m: self.score_move(board, m, tt_move, ply), reverse=True)
+        # Futility Pruning -> Near the horizon, quiet moves can't lift a hopeless static eval above alpha
+        futile = (pruning["futility"] and prune_node and depth <= FUTILITY_DEPTH and abs(alpha) < MATE_BOUND
+                  and static_eval + FUTILITY_BASE + FUTILITY_MARGIN * depth <= alpha)
+        lmp = pruning["lmp"] and prune_node and depth <= LMP_DEPTH
+        lmp_count = LMP_BASE + depth * depth
+        see_pruning = pruning["see"] and prune_node and depth <= SEE_PRUNE_DEPTH
+        lmr = pruning["lmr"] and depth >= 3 and not in_check
+        
+        # Expanding -> Materialize this node's accumulators so children can update from them
+        self.get_accumulators(board, ply)
         
         best_score = -INF
-        best_move = None
+        best_move = NO_MOVE
         start_alpha = alpha
         
-        for i, move in enumerate(moves):
-            nw, nb = self.get_accumulators(board, move, acc_w, acc_b)
-            board.push(move)
+        i = -1 # Index among legal moves
+        quiets_tried = [] # Searched quiets, penalized if a later quiet cuts off
+        # Move Ordering -> Staged picker: TT move, good captures, killers, quiets by history, bad captures
+        for move in MovePicker(self, board, tt_move, ply):
+            is_capture = board.is_capture(move)
+            quiet = not is_capture and not move >> 12
+            
+            # Move Pruning -> Only once a move has been searched and we are not getting mated
+            if i >= 0 and best_score > -MATE_BOUND:
+                # Late Move Pruning -> Late quiets at shallow depth are skipped outright
+                if lmp and quiet and i >= lmp_count:
+                    counts["lmp"] += 1
+                    continue
+                
+                # SEE Pruning -> Skip moves that lose too much material
+                if see_pruning:
+                    margin = SEE_CAPTURE_MARGIN * depth if is_capture else SEE_QUIET_MARGIN * depth * depth
+                    if not self.see(board, move, -margin):
+                        counts["see"] += 1
+                        continue
+            
+            self.make_move(board, move, ply)
+            if not board.was_legal():
+                self.unmake_move(board)
+                continue
+            gives_check = board.is_check()
+            
+            if futile and i >= 0 and quiet and not gives_check:
+                self.unmake_move(board)
+                counts["futility"] += 1
+                continue
+            i += 1
             
             # Principal Variation Search (PVS) Logic
             if i == 0:
-                score = -self.pvs(board, depth - 1, -beta, -alpha, nw, nb, ply + 1)
+                score = -self.pvs(board, depth - 1, -beta, -alpha, ply + 1)
             else:
-                # Late Move Reduction (LMR) -> Prune branches that are not promising (removes "boring" moves)
+                # Late Move Reduction (LMR) -> Reduce late quiet moves by the log(depth) * log(moves) table
                 reduction = 0
-                if depth >= 3 and i >= 3 and not board.is_capture(move) and not board.is_check():
-                     prior = self.history.get((board.turn, move.from_square, move.to_square), 0)
-                     # reduction = self.reduction_table[depth][i]... simplified:
-                     reduction = 1
-                     if i > 8: reduction = 2
+                if lmr and i >= LMR_MIN_MOVES and quiet and not gives_check:
+                    reduction = self.reduction_table[min(depth, 63)][min(i, 63)]
+                    if pv_node: reduction -= 1
+                    reduction = max(0, min(reduction, depth - 2))
+                    if reduction:
+                        counts["lmr"] += 1
+                        stats.lmr_reductions += 1
                 
                 # Search with null window -> Search with a smaller window to prune branches that are not promising
-                score = -self.pvs(board, depth - 1 - reduction, -alpha - 1, -alpha, nw, nb, ply + 1)
+                score = -self.pvs(board, depth - 1 - reduction, -alpha - NULL_WINDOW, -alpha, ply + 1)
                 
                 # Re-search if failed high or reduced -> Re-search if the score is higher than the alpha or if the reduction was too high
                 # AKA "wait this move is actually good, run pvs search again"
                 if score > alpha and (score < beta or reduction > 0):
-                    score = -self.pvs(board, depth - 1, -beta, -alpha, nw, nb, ply + 1)
+                    if reduction: stats.lmr_researches += 1
+                    score = -self.pvs(board, depth - 1, -beta, -alpha, ply + 1)
             
-            board.pop()
+            self.unmake_move(board)
             
             if self.stopped: return 0
+            if quiet: quiets_tried.append(move)
             
             if score > best_score:
                 best_score = score
@@ -370,59 +642,384 @@ class Searcher:
                 
             if score > alpha:
                 alpha = score
+                if pv_node:
+                    self.update_pv(move, ply)
                 if alpha >= beta:
                     # Beta Cutoff -> Prune branches that are not promising
-                    # Update Killers -> Update killers to keep track of the best moves
-                    if not board.is_capture(move):
-                        if ply not in self.killers: self.killers[ply] = [None, None]
-                        self.killers[ply][1] = self.killers[ply][0]
-                        self.killers[ply][0] = move
-                        
-                        # Update History -> Update history to keep track of the best moves
-                        k = (board.turn, move.from_square, move.to_square)
-                        self.history[k] = self.history.get(k, 0) + depth * depth
+                    stats.cutoffs += 1
+                    if i == 0: stats.first_move_cutoffs += 1
+                    # Quiet Heuristics -> Killers, countermove and history learn from the cutoff
+                    if quiet:
+                        quiets_tried.pop()
+                        self.update_quiet_stats(board, move, quiets_tried, depth, ply)
                         
                     # Store TT BETA -> Store the beta value in the transposition table
-                    self.tt[key] = (depth, best_score, 2, move) # 2 = BETA
+                    self.tt.store(key, depth, score_to_tt(best_score, ply), 2, move) # 2 = BETA
                     return beta
         
+        # Game Over -> No legal move: checkmate or stalemate (pruning never skips the first legal move)
+        if i < 0:
+            best_score = -MATE_SCORE + ply if in_check else 0
+            self.tt.store(key, depth, score_to_tt(best_score, ply), 0, NO_MOVE)
+            return best_score
+        
         # Store TT
         flag = 0 if best_score > start_alpha else 1 # 0=EXACT, 1=ALPHA
-        self.tt[key] = (depth, best_score, flag, best_move)
+        self.tt.store(key, depth, score_to_tt(best_score, ply), flag, best_move)
         return best_score
 
+    # PV Update -> Line at ply = move + the child's line
+    def update_pv(self, move, ply):
+        row = self.pv_table[ply]
+        n = self.pv_length[ply + 1]
+        row[0] = move
+        row[1:n + 1] = self.pv_table[ply + 1][:n]
+        self.pv_length[ply] = n + 1
+
+    # Root Search -> PVS over the legal root moves from `root_moves[first]` on (MultiPV: earlier lines are excluded), counting the nodes spent on each
+    def search_root(self, board, depth, alpha, beta, first=0):
+        self.nodes += 1
+        best_score = -INF
+        start_alpha = alpha
+        best = self.root_moves[first][0] if first < len(self.root_moves) else NO_MOVE
+        for index, entry in enumerate(self.root_moves[first:]):
+            move = entry[0]
+            nodes = self.nodes + self.qnodes
+            self.make_move(board, move, 0)
+            if index == 0:
+                score = -self.pvs(board, depth - 1, -beta, -alpha, 1)
+            else:
+                score = -self.pvs(board, depth - 1, -alpha - NULL_WINDOW, -alpha, 1)
+                if score > alpha and score < beta:
+                    score = -self.pvs(board, depth - 1, -beta, -alpha, 1)
+            self.unmake_move(board)
+            entry[1] += self.nodes + self.qnodes - nodes
+            
+            if self.stopped: break
+            
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                # New Best Move -> Completed within (or above) the window, safe to play even if the search stops later
+                best = move
+                self.update_pv(move, 0)
+                entry[2] = score
+                entry[3] = [decode_move(m) for m in self.pv_table[0][:self.pv_length[0]]]
+                if first == 0:
+                    self.root_best = move
+                    self.pv = entry[3]
+                if score >= beta:
+                    break
+                alpha = score
+        
+        if not self.root_moves:
+            best_score = -MATE_SCORE if board.is_check() else 0 # Checkmate or stalemate at the root
+        elif not self.stopped and first == 0:
+            flag = 2 if best_score >= beta else 0 if best_score > start_alpha else 1
+            self.tt.store(board.key, depth, best_score, flag, best)
+        
+        # Root Ordering -> Best move first, then by subtree size (moves that took more nodes to refute are likelier to be best)
+        self.root_moves[first:] = sorted(self.root_moves[first:], key=lambda e: (e[0] == best, e[1]), reverse=True)
+        return best_score
+
+    # Root Moves -> [move, nodes, score, pv] for each legal move, in MovePicker order (TT move, captures, ...) before the first iteration
+    def init_root_moves(self, board):
+        entry = self.tt.probe(board.key)
+        legal = set(board.legal_moves())
+        ordered = [move for move in MovePicker(self, board, entry & 0xFFFF if entry else NO_MOVE, 0) if move in legal]
+        self.root_moves = [[move, 0, -INF, []] for move in dict.fromkeys(ordered)]
+        self.root_best = self.root_moves[0][0] if self.root_moves else NO_MOVE
+        self.pv = []
+
+    # Aspiration Windows -> Search depth `d` in a window around `score`, widening on each fail low/high
+    def aspiration_search(self, board, d, score, first=0):
+        delta = ASPIRATION_WINDOW
+        if d >= ASPIRATION_DEPTH and abs(score) < MATE_BOUND:
+            alpha, beta = score - delta, score + delta
+        else:
+            alpha, beta = -INF, INF
+        
+        while True:
+            for entry in self.root_moves[first:]:
+                entry[1] = 0
+            score = self.search_root(board, d, alpha, beta, first)
+            if self.stopped:
+                return score
+            if score <= alpha:
+                beta = (alpha + beta) / 2 # Fail low -> also pull beta in, the true score is below the old window
+                alpha = max(score - delta, -INF)
+            elif score >= beta:
+                beta = min(score + delta, INF)
+            else:
+                return score
+            delta *= ASPIRATION_GROWTH
+            if delta > ASPIRATION_MAX:
+                alpha, beta = -INF, INF
+
+    # Lazy SMP -> threads > 1 moves the TT into shared memory and starts threads - 1 helper processes
+    def set_threads(self, threads):
+        threads = max(1, int(threads))
+        if threads > 1 and not can_start_helpers():
+            print(f"Warning: Threads {threads} ignored, a daemonic process cannot start helper processes. Searching single-threaded.")
+            threads = 1
+        if threads == self.threads and (threads == 1) == (self.helpers is None):
+            return
+        self.stop_ponder()
+        self.close()
+        size_mb = self.tt.size_mb
+        self.threads = threads
+        if threads > 1:
+            self.tt = SharedTranspositionTable(size_mb)
+            self.helpers = HelperPool(threads, self.model_path, self.backend, self.tt)
+            if not self.close_registered:
+                atexit.register(self.close)
+                self.close_registered = True
+        else:
+            self.tt = TranspositionTable(size_mb)
+
+    # Hash -> Resizes the TT to `size_mb` (emptied), helpers are restarted on the new shared table
+    def set_hash(self, size_mb):
+        size_mb = max(1, int(size_mb))
+        if size_mb == self.tt.size_mb:
+            return
+        self.stop_ponder()
+        threads = self.threads
+        self.close()
+        self.tt = TranspositionTable(size_mb)
+        self.threads = 1
+        self.set_threads(threads)
+
+    # Shutdown -> Stop the helpers and release the shared TT
+    def close(self):
+        if self.helpers is not None:
+            self.helpers.close()
+            self.helpers = None
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.close()
+            self.tt = TranspositionTable(self.tt.size_mb)
+
+    def start_helpers(self, board, depth):
+        if self.helpers is not None:
+            self.helpers.start(board, depth, self.tt.generation)
+
+    def stop_helpers(self):
+        if self.helpers is not None:
+            self.helpers.stop()
+
+    # New Game -> Forget positions and heuristics from the previous game
+    def new_game(self):
+        self.stop_ponder()
+        self.tt.clear()
+        self.eval_cache.clear()
+        self.history.fill(0)
+        self.killers.fill(0)
+        self.countermoves.fill(0)
+
     # Gets move for board
-    def get_move(self, board, depth=5):
+    def get_move(self, board, depth=5, time_limit=None, multipv=None, profile=None):
+        """
+        Searches `board` up to `depth` plies within `time_limit` (a chess.engine.Limit: movetime, clocks,
+        increments, movestogo, nodes). No limit means the default fixed move time.
+        With `multipv` = K, returns the top K root moves instead of the best one, as a best-first list of
+        {"multipv", "move", "score", "pv", "depth"} dicts (fewer if there are fewer legal moves).
+        `profile` ("cprofile" / "sample", default: the BOT_PROFILE environment variable) profiles this search,
+        the report paths and stage totals are left in `last_profile`. A ponder hit is never profiled.
+        """
+        profile = profile_mode(profile)
         if not self.model_loaded:
             l = list(board.legal_moves)
+            if multipv is not None:
+                return [{"multipv": i + 1, "move": m, "score": 0.0, "pv": [m], "depth": 0} for i, m in enumerate(l[:multipv])]
             return l[0] if l else None
 
+        # Pondering -> The background search continues on a hit, and is cancelled on a miss (MultiPV always searches afresh)
+        if self.ponder_thread is not None:
+            if multipv is None and chess.polyglot.zobrist_hash(board) == self.ponder_key:
+                move = self.ponder_hit(board, time_limit)
+                if move is not None:
+                    return move
+            self.stop_ponder()
+
+        self.timer.start(time_limit, board.turn, board.ply())
+        if time_limit is not None and time_limit.depth:
+            depth = min(depth, time_limit.depth)
+        
+        # Search Board -> Convert once at the root, the search only uses the bitboard representation
+        search_board = SearchBoard.from_board(board)
+        self.begin_search()
+        self.start_helpers(board, depth)
+        profiler = SearchProfiler(profile) if profile else None
+        if profiler:
+            profiler.start()
+        move = self.iterative_deepening(search_board, depth, multipv=multipv or 1)
+        if profiler:
+            self.last_profile = profiler.stop(board.fen(), self.stats.depth, self.stats.total_nodes, self.stats)
+            if self.verbose:
+                print(f"Info: Profile {self.last_profile['table']}")
+        self.stop_helpers()
+        if multipv is not None:
+            return self.lines
+        return move
+
+    # Search Setup -> Reset per-search state (on the caller's thread, before any background search starts)
+    def begin_search(self):
         self.nodes = 0
-        self.start_time = time.time()
+        self.qnodes = 0
         self.stopped = False
-        self.killers = {}
-        
-        best_move_global = None
-        
-        # Root Accumulators -> Get the accumulators for the root position (NNUE)
-        f_w = get_halfkp_features(board, perspective=chess.WHITE)
-        f_b = get_halfkp_features(board, perspective=chess.BLACK)
-        with torch.no_grad():
-            rw = self.model.get_accumulator(torch.tensor(f_w, dtype=torch.long, device=self.device))
-            rb = self.model.get_accumulator(torch.tensor(f_b, dtype=torch.long, device=self.device))
+        self.killers.fill(0)
+        self.history >>= HISTORY_AGING # Age History -> Older moves' statistics fade but still order the new search
+        self.tt.new_search() # Age the TT -> entries from previous moves/games get replaced first
+        self.eval_cache.reset_stats()
+        self.accumulators.reset_stats()
+        self.stats.reset()
+        self.prune_counts = dict.fromkeys(PRUNING, 0)
 
+    def iterative_deepening(self, board, depth, start_depth=1, multipv=1):
+        # Root Accumulators -> Get the accumulators for the root position (NNUE)
+        self.set_root_accumulators(board)
+        self.get_accumulators(board, 0)
+        self.init_root_moves(board)
+        lines = min(multipv, len(self.root_moves))
+        self.lines = []
+        
         # Iterative Deepening -> Search deeper and deeper until the time runs out
-        for d in range(1, depth + 1):
-            score = self.pvs(board, d, -INF, INF, rw, rb, 0)
+        score = 0
+        for d in range(start_depth, depth + 1):
+            # MultiPV -> Line i searches the root moves not already taken by lines 0..i-1, all sharing the TT
+            for first in range(max(1, lines)):
+                center = self.root_moves[first][2] if first and self.root_moves[first][2] > -INF else score
+                line_score = self.aspiration_search(board, d, center, first)
+                if first == 0:
+                    score = line_score
+                if self.stopped:
+                    break
             
             if self.stopped:
                 break
-                
-            # Retrieve best move from TT for this position -> Retrieve the best move from the transposition table for this position
-            key = chess.polyglot.zobrist_hash(board)
-            if key in self.tt:
-                _, _, _, m = self.tt[key]
-                best_move_global = m
-                print(f"Info: Depth {d} Score {score:.2f} Move {m} Nodes {self.nodes} Time {time.time()-self.start_time:.2f}s")
+            
+            if lines > 1:
+                # Lines are searched best-first, but a later line can still come out ahead: order them by score
+                self.root_moves[:lines] = sorted(self.root_moves[:lines], key=lambda e: e[2], reverse=True)
+                self.root_best = self.root_moves[0][0]
+                self.pv = self.root_moves[0][3]
+                score = self.root_moves[0][2]
+            self.lines = [{"multipv": i + 1, "move": decode_move(e[0]), "score": e[2], "pv": e[3], "depth": d} for i, e in enumerate(self.root_moves[:lines])]
+            
+            if self.verbose:
+                for line in self.lines:
+                    pv = " ".join(move.uci() for move in line["pv"])
+                    multipv_info = f" MultiPV {line['multipv']}" if lines > 1 else ""
+                    print(f"Info: Depth {d}{multipv_info} Score {line['score']:.2f} Nodes {self.nodes} QNodes {self.qnodes} Hashfull {self.tt.hashfull():.1f}% EvalHits {self.eval_cache.hit_rate():.1f}% Time {self.timer.elapsed():.2f}s PV {pv}")
+            
+            self.stats.depth = d
+            self.stats.score = score
+            self.stats.pv = self.pv
+            self.stats.iterations.append((d, self.nodes + self.qnodes, self.timer.elapsed()))
+            
+            # Soft Deadline -> Stop early on a stable best move, keep going while the score is dropping
+            if self.timer.iteration_done(self.root_best, score):
+                break
+        
+        # No Completed Iteration -> Lines from the ordered root moves, so MultiPV callers always get at least one
+        if not self.lines and self.root_moves:
+            self.root_moves.sort(key=lambda e: e[0] != self.root_best) # Stable: the best move so far first, then move order
+            self.lines = [{"multipv": i + 1, "move": decode_move(e[0]), "score": e[2] if e[2] > -INF else 0.0, "pv": e[3] or [decode_move(e[0])], "depth": 0}
+                          for i, e in enumerate(self.root_moves[:max(1, lines)])]
+
+        # Best Move -> Last root move that completed above alpha (the first legal move if the deadline hit before any did)
+        best_move_global = decode_move(self.root_best) if self.root_best else None
+        
+        self.collect_stats()
+        if self.verbose:
+            print("Info: Pruning " + " ".join(f"{name} {count}" for name, count in self.prune_counts.items()))
+            print(f"Info: Stats {self.stats}")
             
         return best_move_global
+
+    # Stats -> Copy the counters kept by the search's components into `stats` (called when a search ends)
+    def collect_stats(self):
+        stats = self.stats
+        stats.nodes = self.nodes
+        stats.qnodes = self.qnodes
+        stats.eval_probes = self.eval_cache.probes
+        stats.eval_hits = self.eval_cache.hits
+        stats.acc_updates = self.accumulators.updates
+        stats.acc_refreshes = self.accumulators.refreshes
+        stats.acc_time = self.accumulators.time
+        stats.time = self.timer.elapsed()
+        return stats
+
+    # Engine Info -> The last search as a chess.engine.InfoDict (score from the root side to move's point of view)
+    def info(self, turn):
+        stats = self.stats
+        score = stats.score
+        if score >= MATE_BOUND:
+            engine_score = chess.engine.Mate((MATE_SCORE - int(score) + 1) // 2)
+        elif score <= -MATE_BOUND:
+            engine_score = chess.engine.Mate(-((MATE_SCORE + int(score)) // 2))
+        else:
+            engine_score = chess.engine.Cp(score_to_cp(score))
+        info = {
+            "score": chess.engine.PovScore(engine_score, turn),
+            "depth": stats.depth,
+            "seldepth": stats.seldepth,
+            "nodes": stats.total_nodes,
+            "nps": stats.nps,
+            "time": stats.time,
+            "hashfull": int(self.tt.hashfull() * 10), # Permill
+        }
+        if stats.pv:
+            info["pv"] = list(stats.pv)
+        return info
+
+    # Ponder -> Search the expected reply on a background thread while the opponent thinks
+    def start_ponder(self, board, depth=MAX_DEPTH):
+        """
+        `board` is the position after our move (opponent to move). Searches it after the expected reply (PV or TT move)
+        with no deadline, until `get_move` is called (hit -> the search continues on the clock, miss -> cancelled)
+        or `stop_ponder`. Returns the reply pondered on, or None.
+        """
+        self.stop_ponder()
+        if not self.model_loaded:
+            return None
+        # Expected Reply -> Second move of the last PV if we just played its first, else the TT move
+        if len(self.pv) >= 2 and board.move_stack and board.move_stack[-1] == self.pv[0]:
+            reply = self.pv[1]
+        else:
+            entry = self.tt.probe(chess.polyglot.zobrist_hash(board))
+            reply = decode_move(entry & 0xFFFF) if entry else None
+        if reply is None or not board.is_legal(reply):
+            return None
+        ponder_board = board.copy()
+        ponder_board.push(reply)
+        if ponder_board.is_game_over():
+            return None
+
+        self.ponder_key = chess.polyglot.zobrist_hash(ponder_board)
+        self.ponder_result = None
+        self.timer.start(chess.engine.Limit(), ponder_board.turn, ponder_board.ply()) # No deadline until the hit
+        self.begin_search()
+        self.start_helpers(ponder_board, depth)
+        self.ponder_thread = threading.Thread(target=self._ponder, args=(SearchBoard.from_board(ponder_board), depth), daemon=True)
+        self.ponder_thread.start()
+        return reply
+
+    def _ponder(self, board, depth):
+        self.ponder_result = self.iterative_deepening(board, depth)
+
+    # Ponder Hit -> Put the running search on the clock (time already pondered counts) and wait for its move
+    def ponder_hit(self, board, time_limit):
+        self.timer.ponderhit(time_limit, board.turn, board.ply())
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        self.stop_helpers()
+        return self.ponder_result
+
+    # Ponder Miss / Shutdown -> Abort the background search and wait for it to unwind
+    def stop_ponder(self):
+        if self.ponder_thread is None:
+            return
+        self.stopped = True
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        self.stop_helpers()
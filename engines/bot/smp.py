@@ -0,0 +1,170 @@
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import chess
+import chess.engine
+import torch
+from engines.bot.tt import TranspositionTable, table_entries
+from engines.bot.bitboard import SearchBoard
+
+STOP_TIMEOUT = 5.0 # Seconds to wait for the helpers to acknowledge a stop
+STARTUP_TIMEOUT = 120.0 # Seconds to wait for the helpers to load the model
+READY = 0 # Job id reported once a helper is ready
+HELPER_HISTORY_NOISE = 512 # Max random history offset per helper search (vs HISTORY_MAX = 16384): diverges quiet move ordering
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table stored in a `multiprocessing.shared_memory` block, so every Lazy SMP process reads and writes the same entries.
+    Lockless: slots keep the XOR-verified layout of `TranspositionTable`, torn writes read as misses.
+    """
+    def __init__(self, size_mb=16, name=None):
+        self.shm = None
+        self.owner = False
+        if name is None:
+            self.resize(size_mb)
+        else:
+            self.attach(name, size_mb)
+
+    # Resize -> Creates a new block (owned by this process, unlinked on close)
+    def resize(self, size_mb):
+        self.close()
+        entries = table_entries(size_mb)
+        self.shm = shared_memory.SharedMemory(create=True, size=2 * entries * 8)
+        self.owner = True
+        self.size_mb = size_mb
+        table = np.ndarray((2, entries), dtype=np.uint64, buffer=self.shm.buf)
+        table.fill(0)
+        self.bind(table)
+
+    # Attach -> Maps an existing block created by another process
+    def attach(self, name, size_mb):
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = False
+        self.size_mb = size_mb
+        self.bind(np.ndarray((2, table_entries(size_mb)), dtype=np.uint64, buffer=self.shm.buf))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        if self.shm is None:
+            return
+        # Drop the array views first, the block cannot be closed while they export its buffer
+        self.table = self.keys = self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+def _latest_job(jobs, job):
+    # Skip jobs that went stale while this helper was busy or still starting up
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            return job
+        if job is None:
+            return None
+
+# Helper Process -> Own Searcher (model, accumulators, eval cache, heuristics), shared TT, stopped by the main process
+def _helper_main(index, model_path, backend, tt_name, tt_mb, jobs, done, stop_event):
+    from engines.bot.search import Searcher, MAX_DEPTH, HISTORY_MAX
+    torch.set_num_threads(1)
+    searcher = Searcher(model_path, tt_mb=1, backend=backend)
+    searcher.tt = SharedTranspositionTable(tt_mb, name=tt_name)
+    searcher.stop_event = stop_event
+    searcher.verbose = False
+    rng = np.random.default_rng(index) # Per-helper noise, reproducible across runs
+    done.put(READY)
+
+    while True:
+        job = _latest_job(jobs, jobs.get())
+        if job is None:
+            break
+        job_id, fen, moves, depth, generation = job
+        if not stop_event.is_set():
+            board = chess.Board(fen)
+            for move in moves:
+                board.push_uci(move)
+            searcher.timer.start(chess.engine.Limit(), board.turn, board.ply()) # No deadline, the stop event ends the search
+            searcher.begin_search()
+            searcher.tt.generation = generation
+            # Move Ordering -> Small random history offsets, so each helper orders quiets (and walks the tree) differently
+            searcher.history += rng.integers(-HELPER_HISTORY_NOISE, HELPER_HISTORY_NOISE + 1, size=searcher.history.shape, dtype=searcher.history.dtype)
+            np.clip(searcher.history, -HISTORY_MAX, HISTORY_MAX, out=searcher.history)
+            # Depth Offsets -> Odd helpers start one ply deeper, and helper pairs aim 1, 2, ... plies beyond the main search,
+            # so the processes spread over neighbouring depths instead of all finishing the same iteration
+            max_depth = min(MAX_DEPTH, depth + (index + 1) // 2)
+            searcher.iterative_deepening(SearchBoard.from_board(board), max_depth, start_depth=1 + index % 2)
+        done.put(job_id)
+
+    searcher.tt.close()
+
+# Daemonic processes (e.g. multiprocessing.Pool workers, where lichess-bot plays its games) cannot start children
+def can_start_helpers():
+    return not mp.current_process().daemon
+
+class HelperPool:
+    """
+    Lazy SMP helpers: `threads - 1` processes that search the same root as the main process with no deadline,
+    sharing its transposition table. Only the main process's result is played; the helpers just fill the table.
+    """
+    def __init__(self, threads, model_path, backend, tt):
+        ctx = mp.get_context("spawn") # Fresh interpreters, forking a process with torch threads can deadlock
+        self.stop_event = ctx.Event()
+        self.done = ctx.Queue()
+        self.jobs = []
+        self.processes = []
+        for index in range(1, threads):
+            jobs = ctx.Queue()
+            process = ctx.Process(target=_helper_main, args=(index, model_path, backend, tt.name, tt.size_mb, jobs, self.done, self.stop_event), daemon=True)
+            process.start()
+            self.jobs.append(jobs)
+            self.processes.append(process)
+        self.job_id = READY
+        self.active = False
+
+        # Wait for the helpers to load the model, so the first searches don't stall on their startup
+        for _ in self.processes:
+            try:
+                self.done.get(timeout=STARTUP_TIMEOUT)
+            except queue.Empty:
+                break
+
+    # Start -> Every helper searches `board` (a chess.Board, its move stack gives them the repetition history)
+    def start(self, board, depth, generation):
+        self.stop()
+        self.stop_event.clear()
+        self.job_id += 1
+        job = (self.job_id, board.root().fen(), [move.uci() for move in board.move_stack], depth, generation)
+        for jobs in self.jobs:
+            jobs.put(job)
+        self.active = True
+
+    # Stop -> Signal the helpers and wait until they have all left the current search
+    def stop(self):
+        if not self.active:
+            return
+        self.stop_event.set()
+        pending = len(self.processes)
+        while pending:
+            try:
+                job_id = self.done.get(timeout=STOP_TIMEOUT)
+            except queue.Empty:
+                break # Helper stuck, it skips this job once it gets to it
+            if job_id == self.job_id:
+                pending -= 1
+        self.active = False
+
+    def close(self):
+        self.stop()
+        for jobs in self.jobs:
+            jobs.put(None)
+        for process in self.processes:
+            process.join(STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.jobs = []
+        self.processes = []
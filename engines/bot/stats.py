@@ -0,0 +1,77 @@
+class SearchStats:
+    """
+    Counters of one search, reset by `Searcher.begin_search`.
+    The search increments them inline (plain attribute adds, no locks). Node, eval cache and accumulator counts are
+    kept by their owners and copied in by `Searcher.collect_stats` when the search ends.
+    Times are seconds; movegen/eval/acc/see/tt are the wall time spent inside each stage, the rest is search overhead.
+    """
+    __slots__ = (
+        "depth", "seldepth", "score", "pv", "time", "iterations",
+        "nodes", "qnodes",
+        "tt_probes", "tt_hits", "tt_cutoffs",
+        "acc_updates", "acc_refreshes",
+        "eval_probes", "eval_hits",
+        "cutoffs", "first_move_cutoffs",
+        "nmp_tries", "nmp_cutoffs",
+        "lmr_reductions", "lmr_researches",
+        "movegen_time", "eval_time", "acc_time", "see_time", "tt_time",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.score = 0.0
+        self.pv = []
+        self.iterations = [] # (depth, nodes + qnodes, seconds) at the end of each completed iteration
+        self.time = self.movegen_time = self.eval_time = self.acc_time = self.see_time = self.tt_time = 0.0
+
+    @property
+    def total_nodes(self):
+        return self.nodes + self.qnodes
+
+    @property
+    def nps(self):
+        return int(self.total_nodes / self.time) if self.time > 0 else 0
+
+    # Rates (%) -> 0 when the event never had a chance to happen
+    @staticmethod
+    def rate(part, whole):
+        return 100.0 * part / whole if whole else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.rate(self.tt_hits, self.tt_probes)
+
+    @property
+    def eval_hit_rate(self):
+        return self.rate(self.eval_hits, self.eval_probes)
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self.rate(self.first_move_cutoffs, self.cutoffs)
+
+    @property
+    def nmp_success_rate(self):
+        return self.rate(self.nmp_cutoffs, self.nmp_tries)
+
+    # LMR Success -> The reduced search held (failed low), no full-depth re-search needed
+    @property
+    def lmr_success_rate(self):
+        return self.rate(self.lmr_reductions - self.lmr_researches, self.lmr_reductions)
+
+    def as_dict(self):
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats["pv"] = [move.uci() for move in self.pv]
+        stats["iterations"] = [list(iteration) for iteration in self.iterations]
+        for name in ("nps", "tt_hit_rate", "eval_hit_rate", "first_move_cutoff_rate", "nmp_success_rate", "lmr_success_rate"):
+            stats[name] = getattr(self, name)
+        return stats
+
+    def __str__(self):
+        return (f"Seldepth {self.seldepth} NPS {self.nps} TTHits {self.tt_hit_rate:.1f}% TTCutoffs {self.tt_cutoffs} "
+                f"FirstMoveCutoffs {self.first_move_cutoff_rate:.1f}% NMP {self.nmp_success_rate:.1f}% LMR {self.lmr_success_rate:.1f}% "
+                f"Acc {self.acc_updates}/{self.acc_refreshes} (incremental/full) EvalHits {self.eval_hit_rate:.1f}% "
+                f"Time movegen {self.movegen_time:.2f}s eval {self.eval_time:.2f}s acc {self.acc_time:.2f}s see {self.see_time:.2f}s tt {self.tt_time:.2f}s total {self.time:.2f}s")
@@ -0,0 +1,98 @@
+import os
+import sys
+import chess
+
+# Add project root to sys.path to find engines module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from engines.bot.bitboard import SearchBoard, encode_move
+
+# (name, fen, game history played before the root, moves played on the SearchBoard)
+# "0000" = null move, "undo" = takes back the last move or null move
+# A null move is irreversible for SearchBoard: no repetition is counted across it (python-chess counts through it),
+# so the reference board is rebuilt from the FEN after every null move
+DRAW_SCRIPTS = [
+    ("knight shuffle", chess.STARTING_FEN, [], ["g1f3", "g8f6", "f3g1", "f6g8"] * 2),
+    ("repetition across the root", chess.STARTING_FEN, ["g1f3", "g8f6", "f3g1", "f6g8"], ["g1f3", "g8f6", "f3g1", "f6g8"]),
+    ("pawn move resets", chess.STARTING_FEN, ["g1f3", "g8f6", "f3g1", "f6g8"], ["e2e4", "g8f6", "g1f3", "f6g8", "f3g1", "g8f6", "g1f3", "f6g8", "f3g1"]),
+    ("capture resets", "4k3/8/8/3p4/8/8/8/3RK3 w - - 0 1", ["e1e2", "e8e7", "e2e1", "e7e8"], ["d1d5", "e8e7", "d5d1", "e7e8", "d1d5", "e8e7", "d5d1", "e7e8"]),
+    ("castling rights lost", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", [], ["e1f1", "e8f8", "f1e1", "f8e8"] * 3),
+    ("null move barrier", chess.STARTING_FEN, [], ["g1f3", "0000", "f3g1", "0000", "g1f3", "0000", "f3g1", "0000", "g1f3"]),
+    ("null move in a shuffle", chess.STARTING_FEN, ["g1f3", "g8f6", "f3g1", "f6g8"], ["g1f3", "g8f6", "0000", "f6g8", "0000", "g8f6", "undo", "undo", "undo", "undo", "f3g1", "f6g8"]),
+    ("material traded off", "k7/8/8/8/8/1nB5/8/R3K3 w - - 0 1", [], ["e1e2", "b3a1", "c3a1", "a8b7", "e2e1", "b7a8", "e1e2", "a8b7", "e2e1", "b7a8"]),
+]
+
+# (name, fen, SearchBoard.is_insufficient_material, same as python-chess)
+# SearchBoard only calls kings plus at most one minor piece a draw: a subset of python-chess's dead positions
+MATERIAL_CASES = [
+    ("bare kings", "8/8/4k3/8/8/3K4/8/8 w - - 0 1", True, True),
+    ("lone knight", "8/8/4k3/8/8/3K4/8/6N1 w - - 0 1", True, True),
+    ("lone bishop", "8/8/4k3/8/8/3K4/8/6b1 b - - 0 1", True, True),
+    ("two knights", "8/8/4k3/8/8/3K4/8/5NN1 w - - 0 1", False, True),
+    ("knight against knight", "8/8/4k3/5n2/8/3K4/8/6N1 w - - 0 1", False, True),
+    ("bishop against knight", "8/8/4k3/5n2/8/3K4/8/5B2 w - - 0 1", False, True),
+    ("bishops on the same colour", "8/8/4k3/5b2/8/3K4/8/5B2 w - - 0 1", False, False),
+    ("lone pawn", "8/8/4k3/8/8/3K4/6P1/8 w - - 0 1", False, True),
+    ("lone rook", "8/8/4k3/8/8/3K4/8/6R1 w - - 0 1", False, True),
+    ("lone queen", "8/8/4k3/8/8/3K4/8/6q1 b - - 0 1", False, True),
+]
+
+def check_position(name, board, reference):
+    for count in (2, 3):
+        assert board.is_repetition(count) == reference.is_repetition(count), (name, reference.fen(), count)
+    assert board.is_insufficient_material() == reference.is_insufficient_material(), (name, reference.fen())
+    assert board.is_fifty_moves() == (reference.halfmove_clock >= 100), (name, reference.fen())
+
+def test_draws_match_python_chess():
+    print("Testing SearchBoard draw rules against python-chess...")
+    for name, fen, history, moves in DRAW_SCRIPTS:
+        reference = chess.Board(fen)
+        for uci in history:
+            reference.push_uci(uci)
+        board = SearchBoard.from_board(reference)
+        check_position(name, board, reference)
+
+        undo = [] # (reference before the move, was a null move)
+        for uci in moves:
+            if uci == "undo":
+                reference, null = undo.pop()
+                board.pop_null() if null else board.pop()
+            elif uci == "0000":
+                undo.append((reference.copy(), True))
+                reference.push(chess.Move.null())
+                reference = chess.Board(reference.fen())
+                board.push_null()
+            else:
+                move = chess.Move.from_uci(uci)
+                assert move in reference.legal_moves, (name, uci)
+                undo.append((reference.copy(), False))
+                reference.push(move)
+                board.push(encode_move(move))
+            check_position(name, board, reference)
+            assert board.fen().rsplit(" ", 1)[0] == reference.fen().rsplit(" ", 1)[0], (name, uci) # push_null keeps the fullmove number
+
+def test_null_move_is_a_barrier():
+    print("Testing repetitions are not counted across a null move...")
+    reference = chess.Board()
+    board = SearchBoard.from_board(reference)
+    for uci in ("g1f3", "0000", "f3g1", "0000"):
+        move = chess.Move.from_uci(uci)
+        reference.push(move)
+        board.push_null() if not move else board.push(encode_move(move))
+    assert reference.is_repetition(2) # Back to the start position, python-chess counts it
+    assert not board.is_repetition(2)
+
+def test_insufficient_material():
+    print("Testing is_insufficient_material...")
+    for name, fen, expected, same in MATERIAL_CASES:
+        reference = chess.Board(fen)
+        result = SearchBoard.from_board(reference).is_insufficient_material()
+        assert result == expected, name
+        assert (result == reference.is_insufficient_material()) == same, name
+        assert not result or reference.is_insufficient_material(), (name, "draw python-chess does not see")
+
+if __name__ == "__main__":
+    test_draws_match_python_chess()
+    test_null_move_is_a_barrier()
+    test_insufficient_material()
+    print("OK")
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import chess
+import numpy as np
+import torch
+
+# Add project root to sys.path to find engines module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from engines.bot.model import NNUE
+from engines.bot.inference import NumpyNNUE
+from engines.bot.search import Searcher
+from engines.bot.bitboard import SearchBoard
+
+FENS = [
+    chess.STARTING_FEN,
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 3 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "8/8/4k3/8/2K5/8/3P4/8 w - - 0 1",
+]
+
+# float32 sums in a different order -> scores agree to float32 rounding, not bit patterns
+TOLERANCE = 1e-5
+
+def make_model():
+    torch.manual_seed(0)
+    return NNUE().eval()
+
+def test_forward_matches_torch():
+    print("Testing NumPy forward vs NNUE.forward_network...")
+    model = make_model()
+    nnue = NumpyNNUE(model)
+    rng = np.random.default_rng(0)
+
+    for _ in range(200):
+        acc_us = rng.normal(0, 1, 256).astype(np.float32)
+        acc_them = rng.normal(0, 1, 256).astype(np.float32)
+        with torch.no_grad():
+            expected = model.forward_network(torch.from_numpy(acc_us)[None], torch.from_numpy(acc_them)[None]).item()
+        got = nnue.forward(acc_us, acc_them)
+        assert abs(got - expected) <= TOLERANCE * max(1.0, abs(expected)), (got, expected)
+
+def test_search_evaluate_backends_match():
+    print("Testing Searcher.evaluate with numpy and torch backends...")
+    model = make_model()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.pth")
+        torch.save(model.state_dict(), path)
+        numpy_searcher = Searcher(path, tt_mb=1, backend="numpy")
+        torch_searcher = Searcher(path, tt_mb=1, backend="torch")
+
+    for fen in FENS:
+        board = SearchBoard.from_board(chess.Board(fen))
+        numpy_searcher.set_root_accumulators(board)
+        torch_searcher.set_root_accumulators(board)
+        got = numpy_searcher.evaluate(board, 0)
+        expected = torch_searcher.evaluate(board, 0)
+        assert abs(got - expected) <= TOLERANCE * max(1.0, abs(expected)), (fen, got, expected)
+
+if __name__ == "__main__":
+    test_forward_matches_torch()
+    test_search_evaluate_backends_match()
+    print("OK")
@@ -0,0 +1,49 @@
+import os
+import sys
+import math
+import chess
+import chess.engine
+
+# Add project root to sys.path to find engines module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from engines.bot.search import Searcher, score_to_cp, INFO_CP_MAX, MATE_SCORE
+
+# lichess-bot's default resign_score (config.yml.example): reachable by a lost non-mate score
+RESIGN_SCORE = -1000
+
+def test_cp_scale():
+    print("Testing centipawn conversion of search scores...")
+    assert score_to_cp(0.0) == 0
+    # Win probability 0.9 -> 400 * log10(9) ~ 382 centipawns, symmetric for the other side
+    assert score_to_cp(0.4) == round(400 * math.log10(9)) == -score_to_cp(-0.4)
+    scores = [i / 100 for i in range(-50, 51)]
+    cps = [score_to_cp(s) for s in scores]
+    assert cps == sorted(cps)
+    assert cps[0] == -INFO_CP_MAX and cps[-1] == INFO_CP_MAX
+    assert score_to_cp(3.0) == INFO_CP_MAX # Mop-up past a probability of 1
+    assert score_to_cp(-0.499) <= RESIGN_SCORE < score_to_cp(-0.45)
+
+def test_info_scores():
+    print("Testing Searcher.info scores...")
+    searcher = Searcher(tt_mb=1)
+    cases = [
+        (0.0, chess.engine.Cp(0)),
+        (0.4, chess.engine.Cp(score_to_cp(0.4))),
+        (-0.499, chess.engine.Cp(score_to_cp(-0.499))),
+        (MATE_SCORE - 1, chess.engine.Mate(1)),
+        (MATE_SCORE - 3, chess.engine.Mate(2)),
+        (-(MATE_SCORE - 2), chess.engine.Mate(-1)),
+    ]
+    for score, expected in cases:
+        searcher.stats.score = score
+        for turn in (chess.WHITE, chess.BLACK):
+            pov = searcher.info(turn)["score"]
+            assert pov.turn == turn and pov.relative == expected, (score, pov)
+    searcher.stats.score = -0.499
+    assert searcher.info(chess.WHITE)["score"].relative.score() <= RESIGN_SCORE
+
+if __name__ == "__main__":
+    test_cp_scale()
+    test_info_scores()
+    print("OK")
@@ -0,0 +1,32 @@
+import os
+import sys
+import chess
+
+# Add project root to sys.path to find engines module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from engines.bot.bitboard import SearchBoard
+from engines.bot.perft import PERFT_SUITE, PerftTable, perft, divide, reference_divide, verify_divide, suite_depth
+
+# Small enough for the test run, deep enough to reach every ep/castling/promotion edge case of the suite
+MAX_NODES = 20000
+
+def test_suite_counts():
+    print("Testing SearchBoard perft on the suite positions...")
+    for name, fen, counts in PERFT_SUITE:
+        depth = suite_depth(counts, MAX_NODES)
+        board = SearchBoard.from_board(chess.Board(fen))
+        assert perft(board, depth) == counts[depth - 1], (name, depth)
+        assert perft(board, depth, PerftTable(1)) == counts[depth - 1], (name, depth, "hashed")
+        assert board.fen() == chess.Board(fen).fen(), (name, "make/unmake left the board changed")
+
+def test_divide_matches_python_chess():
+    print("Testing divide against python-chess...")
+    for name, fen, _ in PERFT_SUITE[:6]:
+        board = SearchBoard.from_board(chess.Board(fen))
+        assert verify_divide(divide(board, 2), reference_divide(fen, 2)) == [], name
+
+if __name__ == "__main__":
+    test_suite_counts()
+    test_divide_matches_python_chess()
+    print("OK")
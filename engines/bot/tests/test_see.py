@@ -0,0 +1,53 @@
+import os
+import sys
+import chess
+
+# Add project root to sys.path to find engines module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from engines.bot.bitboard import SearchBoard, encode_move
+
+# (name, fen, uci, exact exchange value) -> see_ge must hold at the value and fail one centipawn above it
+# Values follow SEE_VALUES (P=100, N=320, B=330, R=500, Q=900)
+SEE_CASES = [
+    ("undefended pawn", "4k3/8/8/3p4/8/8/8/3RK3 w - - 0 1", "d1d5", 100),
+    ("defended pawn", "3rk3/8/8/3p4/8/8/8/3RK3 w - - 0 1", "d1d5", -400),
+    ("x-ray rook battery", "3r2k1/8/8/3p4/8/8/3R4/3R2K1 w - - 0 1", "d2d5", 100),
+    ("x-ray on both sides", "3q2k1/3r4/8/3p4/8/8/3R4/3R2K1 w - - 0 1", "d2d5", -400),
+    ("x-ray bishop behind pawn", "6k1/8/2p5/3p4/4P3/5B2/8/6K1 w - - 0 1", "e4d5", 100),
+    ("pinned defender still counts", "4k3/3n4/8/4p3/B7/8/8/4R1K1 w - - 0 1", "e1e5", -400),
+    ("en passant", "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2", "e5d6", 100),
+    ("en passant recaptured", "4k3/2p5/8/3pP3/8/8/8/6K1 w - d6 0 2", "e5d6", 0),
+    ("en passant opens the file", "4k3/2p5/8/3pP3/8/8/8/3R2K1 w - d6 0 2", "e5d6", 100),
+    ("promotion capture", "r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7a8q", 1300),
+    ("promotion capture recaptured", "r3k3/1P6/1n6/8/8/8/8/4K3 w - - 0 1", "b7a8q", 400),
+    ("underpromotion capture recaptured", "r3k3/1P6/1n6/8/8/8/8/4K3 w - - 0 1", "b7a8n", 400),
+    ("quiet promotion into a rook", "r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8q", -100),
+    ("king recaptures", "3k4/3p4/8/8/8/8/8/3R2K1 w - - 0 1", "d1d7", -400),
+    ("king cannot recapture a defended square", "3k4/3p4/8/8/8/8/3R4/3R2K1 w - - 0 1", "d2d7", 100),
+    ("black x-ray battery", "3r2k1/3r4/8/8/3P4/4P3/8/6K1 b - - 0 1", "d7d4", -300),
+]
+
+def test_see_thresholds():
+    print("Testing see_ge exchange values...")
+    for name, fen, uci, value in SEE_CASES:
+        board = chess.Board(fen)
+        assert chess.Move.from_uci(uci) in board.legal_moves, (name, "illegal test move")
+        search_board = SearchBoard.from_board(board)
+        move = encode_move(chess.Move.from_uci(uci))
+        assert search_board.see_ge(move, value), (name, value)
+        assert not search_board.see_ge(move, value + 1), (name, value + 1)
+        assert search_board.see_ge(move, 0) == (value >= 0), (name, 0)
+
+def test_see_leaves_board_unchanged():
+    print("Testing see_ge has no side effects...")
+    for name, fen, uci, _ in SEE_CASES:
+        search_board = SearchBoard.from_board(chess.Board(fen))
+        key = search_board.key
+        search_board.see_ge(encode_move(chess.Move.from_uci(uci)), 0)
+        assert search_board.key == key and search_board.fen() == chess.Board(fen).fen(), name
+
+if __name__ == "__main__":
+    test_see_thresholds()
+    test_see_leaves_board_unchanged()
+    print("OK")
@@ -0,0 +1,49 @@
+import os
+import sys
+
+# Add project root to sys.path to find engines module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from engines.bot.tt import TranspositionTable, table_entries, GEN_MASK, DEPTH_SHIFT, FLAG_SHIFT, SCORE_SHIFT, bits_to_score
+from engines.bot.search import Searcher, score_to_tt, score_from_tt, MATE_SCORE
+
+KEY = 0x9D39247E33776D41
+
+def test_generation_wrap():
+    print("Testing TT entries survive the generation wrap...")
+    tt = TranspositionTable(1)
+    for _ in range(3 * GEN_MASK):
+        tt.new_search()
+        assert 1 <= tt.generation <= GEN_MASK
+        # Move, depth, flag and score all 0: the generation is the only non-zero field of the data word
+        tt.store(KEY, 0, 0.0, 0, 0)
+        entry = tt.probe(KEY)
+        assert entry, tt.generation
+        assert (entry >> DEPTH_SHIFT) & 0xFF == 0 and (entry >> FLAG_SHIFT) & 3 == 0
+        assert bits_to_score(entry >> SCORE_SHIFT) == 0.0
+
+def test_mate_scores_are_node_relative():
+    print("Testing TT mate scores are converted between plies...")
+    # Mate in 5 plies from a node at ply 3 (root distance 8), probed at ply 7 -> root distance 12
+    score = MATE_SCORE - 8
+    assert score_from_tt(score_to_tt(score, 3), 7) == MATE_SCORE - 12
+    assert score_from_tt(score_to_tt(-score, 3), 7) == -(MATE_SCORE - 12)
+    assert score_to_tt(0.25, 3) == 0.25 and score_from_tt(-0.25, 7) == -0.25
+
+    tt = TranspositionTable(1)
+    tt.store(KEY, 4, score_to_tt(score, 3), 0, 0)
+    assert score_from_tt(bits_to_score(tt.probe(KEY) >> SCORE_SHIFT), 5) == MATE_SCORE - 10
+
+def test_set_hash():
+    print("Testing Searcher.set_hash...")
+    searcher = Searcher(tt_mb=1)
+    searcher.tt.store(KEY, 4, 0.1, 0, 0)
+    searcher.set_hash(2)
+    assert searcher.tt.size_mb == 2 and searcher.tt.size == table_entries(2)
+    assert not searcher.tt.probe(KEY)
+
+if __name__ == "__main__":
+    test_generation_wrap()
+    test_mate_scores_are_node_relative()
+    test_set_hash()
+    print("OK")
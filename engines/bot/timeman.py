@@ -0,0 +1,101 @@
+import time
+import chess
+import chess.engine
+
+# Constants & Configuration (seconds)
+DEFAULT_MOVE_TIME = 5.0 # Budget when the caller gives no limit at all
+MOVE_OVERHEAD = 0.05 # Kept back per move for Python/network latency
+MIN_THINK_TIME = 0.01 # Never plan for less than this
+DEFAULT_MOVES_TO_GO = 30 # Moves left to plan for in sudden death (shrinks as the game goes on)
+MIN_MOVES_TO_GO = 12
+INC_USAGE = 0.75 # Share of the increment spent on this move
+HARD_RATIO = 4.0 # Hard deadline = soft deadline x this ...
+MAX_USAGE = 0.4 # ... but never more than this share of the remaining clock
+
+# Soft Deadline Scaling -> [iterations the best move has been stable] -> factor (stable moves stop early)
+STABILITY_SCALE = (1.6, 1.25, 1.0, 0.8, 0.65)
+SCORE_DROP = 0.3 # Score fall between iterations (network units) that counts as "in trouble"
+SCORE_DROP_SCALE = 1.5 # Soft deadline extension while in trouble
+NEXT_ITERATION_SHARE = 0.5 # The next iteration costs at least as much as all previous ones -> don't start it past this share
+
+class TimeManager:
+    """
+    Turns a `chess.engine.Limit` (movetime, or wtime/btime/winc/binc/movestogo) into two deadlines:
+    - soft: checked between iterative-deepening iterations, scaled by best-move stability and score drops
+    - hard: checked inside the search (main and quiescence), the search aborts when it passes
+    No time information (e.g. only depth/nodes) means no deadline.
+    """
+    def __init__(self, overhead=MOVE_OVERHEAD):
+        self.overhead = overhead
+        self.start(chess.engine.Limit(time=DEFAULT_MOVE_TIME), chess.WHITE)
+
+    def start(self, limit, turn, ply=0):
+        self.start_time = time.time()
+        self.best_move = None
+        self.last_score = None
+        self.stability = 0
+        self.in_trouble = False
+        self.allocate(limit, turn, ply)
+
+    # Ponder Hit -> The clock starts now: the hard deadline counts from here, the soft one includes the time pondered
+    def ponderhit(self, limit, turn, ply=0):
+        pondered = self.elapsed()
+        self.allocate(limit, turn, ply)
+        if self.hard is not None:
+            self.hard += pondered
+
+    def allocate(self, limit, turn, ply):
+        self.soft = None
+        self.hard = None
+        self.node_limit = limit.nodes if limit is not None else None
+
+        if limit is None:
+            limit = chess.engine.Limit(time=DEFAULT_MOVE_TIME)
+
+        if limit.time is not None:
+            # Fixed time per move -> use all of it
+            self.soft = self.hard = max(MIN_THINK_TIME, limit.time - self.overhead)
+            return
+
+        clock = limit.white_clock if turn == chess.WHITE else limit.black_clock
+        if clock is None:
+            return # Depth/nodes only (or infinite)
+        inc = (limit.white_inc if turn == chess.WHITE else limit.black_inc) or 0.0
+
+        moves_to_go = limit.remaining_moves
+        if not moves_to_go:
+            moves_to_go = max(MIN_MOVES_TO_GO, DEFAULT_MOVES_TO_GO - ply // 8)
+
+        available = max(MIN_THINK_TIME, clock - self.overhead)
+        soft = available / moves_to_go + INC_USAGE * inc
+        hard = min(soft * HARD_RATIO, available if moves_to_go == 1 else available * MAX_USAGE + inc)
+        hard = min(hard, available)
+        self.hard = max(MIN_THINK_TIME, hard)
+        self.soft = max(MIN_THINK_TIME, min(soft, self.hard))
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    # Hard Limit -> Polled from inside the search
+    def hard_expired(self, nodes):
+        if self.node_limit is not None and nodes >= self.node_limit:
+            return True
+        return self.hard is not None and self.elapsed() >= self.hard
+
+    # Soft Limit -> Called after each completed iteration, True when the next one should not start
+    def iteration_done(self, best_move, score):
+        if best_move == self.best_move:
+            self.stability = min(self.stability + 1, len(STABILITY_SCALE) - 1)
+        else:
+            self.stability = 0
+        if self.last_score is not None and score < self.last_score - SCORE_DROP:
+            self.in_trouble = True # Stays on for the rest of this move
+        self.best_move = best_move
+        self.last_score = score
+
+        if self.soft is None:
+            return False
+        scale = STABILITY_SCALE[self.stability]
+        if self.in_trouble:
+            scale *= SCORE_DROP_SCALE
+        return self.elapsed() >= min(self.soft * scale * NEXT_ITERATION_SHARE, self.hard)
@@ -0,0 +1,100 @@
+import struct
+import numpy as np
+
+# Entry Layout -> One 64-bit data word per slot, next to a 64-bit check word (key ^ data)
+# bits  0-15 : move (16-bit search move, see bitboard.encode_move)
+# bits 16-23 : depth
+# bits 24-25 : flag (0 = EXACT, 1 = ALPHA/UPPER, 2 = BETA/LOWER)
+# bits 26-31 : generation (search age, 1..63 so a stored entry is never 0)
+# bits 32-63 : score (float32 bit pattern)
+ENTRY_BYTES = 16 # check (8) + data (8)
+DEPTH_SHIFT = 16
+FLAG_SHIFT = 24
+GEN_SHIFT = 26
+SCORE_SHIFT = 32
+GEN_MASK = 0x3F
+HASHFULL_SAMPLE = 1000 # Entries sampled for hashfull (same as UCI "hashfull" permill)
+
+_F32 = struct.Struct("<f")
+_U32 = struct.Struct("<I")
+
+def score_to_bits(score):
+    return _U32.unpack(_F32.pack(score))[0]
+
+def bits_to_score(bits):
+    return _F32.unpack(_U32.pack(bits))[0]
+
+# Entries for a table of `size_mb`, rounded down to a power of two -> index with a mask instead of a modulo
+def table_entries(size_mb):
+    entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+    return 1 << (entries.bit_length() - 1)
+
+class TranspositionTable:
+    """
+    Fixed-size, preallocated transposition table.
+    Entries live in one [2, size] uint64 NumPy array (check words + packed data), so memory stays flat no matter how many games are played.
+    The check word is key ^ data: a slot whose two words were written by different stores (e.g. racing processes
+    sharing the table, see smp.py) fails the check and reads as a miss, so no locks are needed.
+    """
+    def __init__(self, size_mb=16):
+        self.resize(size_mb)
+
+    def resize(self, size_mb):
+        self.size_mb = size_mb
+        self.bind(np.zeros((2, table_entries(size_mb)), dtype=np.uint64))
+
+    # Bind -> Use `table` ([2, size] uint64: check words, data words) as the storage
+    def bind(self, table):
+        self.table = table
+        self.size = table.shape[1]
+        self.mask = self.size - 1
+        self.keys = table[0]
+        self.data = table[1]
+        self.generation = 1
+
+    def clear(self):
+        self.table.fill(0)
+        self.generation = 1
+
+    # Aging -> Called once per search, entries from older searches become preferred victims.
+    # Generations cycle through 1..63 (never 0): a stored data word is never 0, which `probe` reserves for a miss
+    def new_search(self):
+        self.generation = self.generation % GEN_MASK + 1
+
+    # Probe -> Returns the packed data word, or 0 on a miss (decode with the *_SHIFT constants)
+    def probe(self, key):
+        i = key & self.mask
+        data = int(self.data[i])
+        if int(self.keys[i]) ^ data != key: return 0
+        return data
+
+    # Store -> Depth-and-age replacement: replace if same position, stale entry, or at least as deep
+    def store(self, key, depth, score, flag, move):
+        i = key & self.mask
+        old = int(self.data[i])
+        same_key = (int(self.keys[i]) ^ old) == key
+        if old and not same_key:
+            old_gen = (old >> GEN_SHIFT) & GEN_MASK
+            old_depth = (old >> DEPTH_SHIFT) & 0xFF
+            if old_gen == self.generation and depth < old_depth:
+                return
+
+        move_code = move
+        # Keep the old best move if this search did not find one (e.g. fail low)
+        if move_code == 0 and old and same_key:
+            move_code = old & 0xFFFF
+
+        depth = min(max(depth, 0), 0xFF)
+        data = (move_code
+                | (depth << DEPTH_SHIFT)
+                | (flag << FLAG_SHIFT)
+                | (self.generation << GEN_SHIFT)
+                | (score_to_bits(score) << SCORE_SHIFT))
+        self.data[i] = data
+        self.keys[i] = key ^ data
+
+    # Hashfull -> Percentage of sampled slots filled by the current search generation
+    def hashfull(self):
+        sample = self.data[:min(HASHFULL_SAMPLE, self.size)]
+        used = np.count_nonzero((sample != 0) & (((sample >> GEN_SHIFT) & GEN_MASK) == self.generation))
+        return 100.0 * used / len(sample)
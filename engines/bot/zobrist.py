@@ -0,0 +1,12 @@
+import chess
+import chess.polyglot
+
+# Polyglot Keys -> Same random array as chess.polyglot, so incremental keys match zobrist_hash()
+ZOBRIST = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+TURN_KEY = ZOBRIST[780]
+
+# Piece-square keys: PIECE_KEYS[color][piece_type][square] (color: BLACK=0, WHITE=1)
+PIECE_KEYS = [
+    [[0] * 64] + [[ZOBRIST[64 * ((pt - 1) * 2 + color) + sq] for sq in range(64)] for pt in range(1, 7)]
+    for color in (chess.BLACK, chess.WHITE)
+]
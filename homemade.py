@@ -9,7 +9,7 @@ import random
 from lib.engine_wrapper import MinimalEngine
 from lib.lichess_types import MOVE, HOMEMADE_ARGS_TYPE
 import logging
-from engines.bot.main import get_move
+from engines.bot.main import get_move, get_info, new_game, set_hash, set_threads, start_ponder, stop_ponder, MAX_DEPTH, TT_MB
 
 
 # Use this logger variable to print messages to the console or log files.
@@ -24,12 +24,40 @@ class ExampleEngine(MinimalEngine):
 
 # Custom Random Engine
 class PyBot(ExampleEngine):
-    def search(self, board: chess.Board, limits=None, ponder=False, draw_offered=False, info=None) -> PlayResult:
-        print("GETTING MOVE!")
-        
-        move = get_move(board)
-
-        return PlayResult(move, None)
+    def __init__(self, commands, options, stderr, draw_or_resign, game=None, **popen_args):
+        super().__init__(commands, options, stderr, draw_or_resign, game, **popen_args)
+        set_hash(options.get("Hash", TT_MB)) # homemade_options -> Hash (transposition table MB)
+        # homemade_options -> Threads (Lazy SMP processes, kept across games). Not for the startup engine check (no game):
+        # its helpers would stay alive in the main process for the bot's whole run. Games run in lichess-bot's daemonic
+        # pool workers, which cannot start processes, so there the search falls back to one thread (see set_threads)
+        if game is not None:
+            set_threads(options.get("Threads", 1))
+        new_game() # lichess-bot creates one engine per game -> start from empty caches
+
+    def search(self, board: chess.Board, time_limit: Limit, ponder: bool, draw_offered: bool, root_moves: MOVE) -> PlayResult:
+        time_limit = self.add_go_commands(time_limit)
+
+        # Clock-driven: the time manager ends the iterative deepening, not a fixed depth
+        move = get_move(board, depth=MAX_DEPTH, time_limit=time_limit)
+        info = get_info(board) # Before pondering starts a new search -> score/depth/nodes/nps for print_stats and draw/resign
+
+        # Ponder -> Keep searching the expected reply on the opponent's clock (a hit resumes it in the next search)
+        ponder_move = None
+        if ponder and move is not None:
+            after = board.copy()
+            after.push(move)
+            ponder_move = start_ponder(after)
+
+        result = PlayResult(move, ponder_move, info=info)
+
+        # Draw/Resign -> Same bookkeeping as EngineWrapper.search (null score = no effect on the decision)
+        null_score = chess.engine.PovScore(chess.engine.Mate(1), board.turn)
+        self.scores.append(info.get("score", null_score))
+        return self.offer_draw_or_resign(result, board)
+
+    def quit(self) -> None:
+        stop_ponder()
+        super().quit()
 
 # Minimax engine
 # class PyBot(ExampleEngine):
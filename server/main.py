@@ -9,9 +9,16 @@ from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server.routes import decide, move
+from engines.bot.main import set_hash, set_threads, TT_MB
 
 load_dotenv()
 
+# Engine Threads -> Lazy SMP search processes used by /move (BOT_THREADS, default 1)
+set_threads(int(os.getenv("BOT_THREADS", "1")))
+
+# Engine Hash -> Transposition table size in MB (BOT_HASH, default TT_MB)
+set_hash(int(os.getenv("BOT_HASH", str(TT_MB))))
+
 app = FastAPI()
 
 origins = ["https://www.l145.be", "https://l145.be"]
@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from typing import Literal
+from pydantic import BaseModel, Field
 
 class MoveRequest(BaseModel):
     fen: str
+    multipv: int | None = Field(default=None, ge=1, le=10) # Also return the top N moves with scores and lines
+    profile: Literal["cprofile", "sample"] | None = None # Profile this search (report files written on the server)
 
 class DecideRequest(BaseModel):
     prompt: str
@@ -7,7 +7,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 try:
-    from engines.bot.main import get_move
+    from engines.bot.main import get_move, get_profile
 except ImportError as e:
     print(f"Error importing engine: {e}")
     # We might want to handle this more gracefully or just fail hard since engine is core
@@ -29,15 +29,35 @@ def predict_move(request: MoveRequest):
 
     # Get the best move from the engine
     try:
-        move = get_move(board)
+        lines = None
+        if request.multipv:
+            # MultiPV -> One search for the top N moves, the best one is played
+            lines = [
+                {
+                    "move": line["move"].uci(),
+                    "san": board.san(line["move"]),
+                    "score": line["score"],
+                    "pv": [m.uci() for m in line["pv"]],
+                }
+                for line in get_move(board, multipv=request.multipv, profile=request.profile)
+            ]
+            # No line (e.g. stopped before depth 1 finished) -> Fall back to the single best move
+            move = chess.Move.from_uci(lines[0]["move"]) if lines else get_move(board, profile=request.profile)
+        else:
+            move = get_move(board, profile=request.profile)
         san_move = board.san(move)
         board.push(move)
         
-        return {
+        response = {
             "move": move.uci(),
             "fen": board.fen(),
             "san": san_move
         }
+        if lines is not None:
+            response["lines"] = lines
+        if request.profile:
+            response["profile"] = get_profile() # Report paths + per-stage seconds
+        return response
     except Exception as e:
         print(f"Engine Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))